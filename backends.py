@@ -0,0 +1,171 @@
+import logging
+import os
+import time
+
+import numpy as np
+
+from batching import MAX_BATCH_SIZE
+from config import load_config
+from keypoint_cache import DEFAULT_CACHE_DIR, cached_windows
+
+logger = logging.getLogger(__name__)
+
+# Every backend runs the same classifier, found next to the Keras weights:
+# <stem>.h5, <stem>.float16.tflite / <stem>.int8.tflite (quantize.py) and
+# <stem>.onnx (converted externally, e.g. with tf2onnx)
+BACKENDS = ["keras", "tflite-float16", "tflite-int8", "onnx"]
+
+# "backend" is "auto" or one of BACKENDS. Auto picks the fastest backend
+# whose probabilities on the probe windows stay within "max_drift" of the
+# Keras model with at least "min_agreement" top-1 agreement. Each backend
+# is timed on "benchmark_windows" windows at every one of
+# "benchmark_batch_sizes", the batch sizes the batching front end
+# produces, and ranked by windows/s at the largest. That is the throughput
+# available when sessions contend; at a batch of one, any backend keeps up
+# with a camera. Probe windows come from the keypoint cache, or are random
+# when it is empty.
+DEFAULT_INFERENCE = {
+    "backend": "auto",
+    "max_drift": 0.05,
+    "min_agreement": 0.98,
+    "probe_windows": 64,
+    "benchmark_batch_sizes": [1, MAX_BATCH_SIZE],
+    "benchmark_windows": 320,
+    "threads": 1,
+    "cache_dir": DEFAULT_CACHE_DIR,
+}
+
+
+def load_inference_config(path=None):
+    return load_config("inference", DEFAULT_INFERENCE, path)
+
+
+def backend_paths(model_path):
+    stem = os.path.splitext(model_path)[0]
+    return {
+        "keras": model_path,
+        "tflite-float16": f"{stem}.float16.tflite",
+        "tflite-int8": f"{stem}.int8.tflite",
+        "onnx": f"{stem}.onnx",
+    }
+
+
+def load_backend(name, path, threads=1, warm_up=True):
+    from inference import OnnxClassifier, SignClassifier, TFLiteClassifier
+
+    if name == "keras":
+        return SignClassifier.load(path, warm_up=warm_up)
+    if name.startswith("tflite-"):
+        return TFLiteClassifier.load(path, num_threads=threads, warm_up=warm_up)
+    if name == "onnx":
+        return OnnxClassifier.load(path, num_threads=threads, warm_up=warm_up)
+    raise ValueError(f"Unknown inference backend: {name}")
+
+
+def sample_windows(sequence_length, feature_size, layout, count, cache_dir):
+    windows = None
+    if cache_dir:
+        windows = cached_windows(cache_dir, sequence_length, layout, stride=sequence_length, limit=count)
+    if windows is None or len(windows) == 0:
+        windows = np.random.default_rng(0).random((count, sequence_length, feature_size), dtype=np.float32)
+    return windows
+
+
+def warm_up_classifier(classifier):
+    """get_resource warm-up hook: warms up a configured backend, or reports
+    the warm-up the chosen one already had during selection."""
+    if classifier.warmup_seconds is None:
+        classifier.warm_up()
+    return classifier.warmup_seconds
+
+
+def windows_per_second(classifier, windows, batch_size, total_windows):
+    batch = windows[np.arange(batch_size) % len(windows)]
+    calls = max(1, total_windows // batch_size)
+    start = time.perf_counter()
+    for _ in range(calls):
+        classifier.predict(batch)
+    return calls * batch_size / (time.perf_counter() - start)
+
+
+def benchmark(classifier, windows, batch_sizes, total_windows):
+    """Windows/s at each batch size; ``ranking_rate`` is the one at the largest."""
+    rates = {size: windows_per_second(classifier, windows, size, total_windows) for size in sorted(batch_sizes)}
+    return {"windows_per_second": {size: round(rate, 1) for size, rate in rates.items()},
+            "ranking_rate": rates[max(rates)]}
+
+
+def select_backend(model_path, backend="auto", max_drift=0.05, min_agreement=0.98, probe_windows=64,
+                   benchmark_batch_sizes=(1, MAX_BATCH_SIZE), benchmark_windows=320, threads=1,
+                   cache_dir=DEFAULT_CACHE_DIR, warm_up=True):
+    """Load the classifier for ``model_path`` on the configured or fastest equivalent backend.
+
+    With a fixed ``backend`` that backend is loaded as-is, falling back to
+    Keras if its file is missing. With "auto" the Keras model is the
+    reference: every other backend whose file and runtime are available
+    is checked against it on the probe windows, and the fastest of those
+    that pass (Keras included) is returned; all of them are warmed up
+    first to keep tracing out of the benchmark. Speed is measured at
+    ``benchmark_batch_sizes`` and compared at the largest, so backends
+    that run a batch row by row (``native_batching`` False) are charged
+    for it. ``warm_up`` only applies
+    to a fixed backend. The result carries ``backend`` and a per-backend
+    ``selection`` report.
+    """
+    paths = backend_paths(model_path)
+    if backend != "auto":
+        name = backend if os.path.exists(paths.get(backend, "")) else "keras"
+        if name != backend:
+            logger.warning("Inference backend %s has no model at %s; using keras", backend, paths.get(backend))
+        classifier = load_backend(name, paths[name], threads, warm_up)
+        classifier.backend = name
+        classifier.selection = {name: {"status": "configured"}}
+        logger.info("Inference backend for %s: %s (configured)", model_path, name)
+        return classifier
+
+    reference = load_backend("keras", model_path, threads)
+    windows = sample_windows(reference.sequence_length, reference.feature_size, reference.layout,
+                             probe_windows, cache_dir)
+    expected = reference.predict(windows)
+    candidates = {"keras": reference}
+    selection = {"keras": {"status": "reference",
+                           **benchmark(reference, windows, benchmark_batch_sizes, benchmark_windows)}}
+    for name in BACKENDS[1:]:
+        path = paths[name]
+        if not os.path.exists(path):
+            selection[name] = {"status": "no model file"}
+            continue
+        try:
+            candidate = load_backend(name, path, threads)
+        except ImportError as e:
+            selection[name] = {"status": f"runtime unavailable ({e.name})"}
+            continue
+        except Exception as e:
+            logger.warning("Could not load %s backend from %s: %s", name, path, e)
+            selection[name] = {"status": "load failed"}
+            continue
+        if (candidate.sequence_length, candidate.feature_size) != (reference.sequence_length, reference.feature_size):
+            selection[name] = {"status": "input shape differs"}
+            continue
+        predicted = candidate.predict(windows)
+        drift = float(np.abs(predicted - expected).max())
+        agreement = float(np.mean(np.argmax(predicted, axis=1) == np.argmax(expected, axis=1)))
+        result = {"max_drift": round(drift, 5), "top1_agreement": round(agreement, 4)}
+        if drift > max_drift or agreement < min_agreement:
+            result["status"] = "not equivalent"
+        else:
+            result.update(status="ok", **benchmark(candidate, windows, benchmark_batch_sizes, benchmark_windows))
+            candidates[name] = candidate
+        selection[name] = result
+
+    name = max(candidates, key=lambda n: selection[n]["ranking_rate"])
+    for backend_name, result in selection.items():
+        speed = ", ".join(f"{rate:.0f}/s @{size}" for size, rate in result.get("windows_per_second", {}).items())
+        parity = (f"top-1 agreement {result['top1_agreement']:.1%}, max drift {result['max_drift']:.4f}"
+                  if "max_drift" in result else "")
+        logger.info("  %-15s %-28s %-24s %s", backend_name, result["status"], speed or "-", parity)
+    logger.info("Inference backend for %s: %s (fastest of %d equivalent)", model_path, name, len(candidates))
+    classifier = candidates[name]
+    classifier.backend = name
+    classifier.selection = selection
+    return classifier
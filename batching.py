@@ -0,0 +1,144 @@
+import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Largest batch the batcher hands the classifier by default
+MAX_BATCH_SIZE = 16
+
+
+class _Request:
+    def __init__(self, batch):
+        self.batch = batch
+        self.submitted_at = time.perf_counter()
+        self.future = Future()
+
+
+# Shared front end for one SignClassifier across all sessions
+class BatchingClassifier:
+    """Gathers concurrent ``predict`` calls into dynamic micro-batches.
+
+    Every session's pipeline calls ``predict`` with its own (1, frames,
+    features) window. Instead of each running a batch-of-one, callers wait
+    on a future while a single worker thread collects requests until it
+    has ``max_batch_size`` rows or the oldest request has waited
+    ``max_wait`` seconds, runs them through ``classifier`` in one call and
+    hands each caller its own rows back. It also stops waiting once every
+    caller seen in the last ``active_seconds`` has a request in the batch,
+    so a lone session is not held back by ``max_wait``.
+    """
+
+    def __init__(self, classifier, max_batch_size=MAX_BATCH_SIZE, max_wait=0.005, active_seconds=1.0, window=1000):
+        self.classifier = classifier
+        self.max_batch_size = max(1, int(max_batch_size))
+        self.max_wait = max_wait
+        self.active_seconds = active_seconds
+        self.requests = 0
+        self.batches = 0
+        self.errors = 0
+        self._batch_sizes = deque(maxlen=window)
+        self._queue_waits = deque(maxlen=window)
+        self._pending = deque()
+        # Thread id -> last submit time of each recent caller (one per session pipeline)
+        self._callers = {}
+        self._cond = threading.Condition()
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="sign-batcher", daemon=True)
+        self._thread.start()
+
+    def predict(self, batch):
+        """Return class probabilities for a (batch, frames, features) array."""
+        return self.submit(batch).result()
+
+    def submit(self, batch):
+        request = _Request(np.asarray(batch, dtype=np.float32))
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("BatchingClassifier is closed")
+            self._pending.append(request)
+            self._callers[threading.get_ident()] = request.submitted_at
+            self.requests += 1
+            self._cond.notify()
+        return request.future
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+        self._thread.join()
+
+    def stats(self):
+        sizes = np.fromiter(self._batch_sizes, dtype=np.float64)
+        waits = np.fromiter(self._queue_waits, dtype=np.float64) * 1000.0
+        return {
+            "batcher_requests": self.requests,
+            "batcher_batches": self.batches,
+            "batcher_errors": self.errors,
+            "batcher_queue": len(self._pending),
+            "batcher_mean_batch": round(float(sizes.mean()), 2) if sizes.size else 0.0,
+            "batcher_max_batch": int(sizes.max()) if sizes.size else 0,
+            "batcher_wait_p50_ms": round(float(np.percentile(waits, 50)), 3) if waits.size else 0.0,
+            "batcher_wait_p95_ms": round(float(np.percentile(waits, 95)), 3) if waits.size else 0.0,
+        }
+
+    def _collect(self):
+        """Block for the next micro-batch; return [] once closed and drained."""
+        with self._cond:
+            while not self._pending:
+                if self._closed:
+                    return []
+                self._cond.wait()
+            deadline = self._pending[0].submitted_at + self.max_wait
+            expected = min(self._active_callers(), self.max_batch_size)
+            rows = 0
+            taken = []
+            while True:
+                while self._pending and rows + len(self._pending[0].batch) <= self.max_batch_size:
+                    request = self._pending.popleft()
+                    taken.append(request)
+                    rows += len(request.batch)
+                # A single request larger than max_batch_size still runs on its own
+                if not taken:
+                    taken.append(self._pending.popleft())
+                    break
+                remaining = deadline - time.perf_counter()
+                if len(taken) >= expected or rows >= self.max_batch_size or remaining <= 0 or self._closed:
+                    break
+                self._cond.wait(remaining)
+            return taken
+
+    def _active_callers(self):
+        cutoff = time.perf_counter() - self.active_seconds
+        for ident in [i for i, seen in self._callers.items() if seen < cutoff]:
+            del self._callers[ident]
+        return max(1, len(self._callers))
+
+    def _run(self):
+        while True:
+            taken = self._collect()
+            if not taken:
+                return
+            started = time.perf_counter()
+            for request in taken:
+                self._queue_waits.append(started - request.submitted_at)
+            try:
+                batch = taken[0].batch if len(taken) == 1 else np.concatenate([r.batch for r in taken])
+                probabilities = self.classifier.predict(batch)
+            except Exception as e:
+                self.errors += 1
+                logger.exception("Batched inference failed")
+                for request in taken:
+                    request.future.set_exception(e)
+                continue
+            self.batches += 1
+            self._batch_sizes.append(len(batch))
+            offset = 0
+            for request in taken:
+                size = len(request.batch)
+                request.future.set_result(probabilities[offset:offset + size])
+                offset += size
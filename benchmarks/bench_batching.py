@@ -0,0 +1,82 @@
+# Load test: per-session SignClassifier calls vs. the shared BatchingClassifier
+#
+#   python -m benchmarks.bench_batching [--sessions 1 2 4 8 16 32] [--model ...]
+#
+# Each simulated session is a thread that submits one (1, 30, 1662) window
+# at a time, as a SignPipeline classify worker does. Reports aggregate
+# windows/s, per-call latency and the batch sizes the batcher formed.
+import argparse
+import os
+import threading
+import time
+
+import numpy as np
+
+from batching import BatchingClassifier
+from benchmarks.bench_inference import DEFAULT_MODEL, build_standin_model
+from inference import SignClassifier
+from keypoints import KEYPOINT_SIZE
+from sequence_buffer import SEQUENCE_LENGTH
+
+
+def run_sessions(predict, sessions, seconds):
+    rng = np.random.default_rng(0)
+    windows = rng.random((sessions, 1, SEQUENCE_LENGTH, KEYPOINT_SIZE), dtype=np.float32)
+    latencies = [[] for _ in range(sessions)]
+    start_barrier = threading.Barrier(sessions + 1)
+    deadline = [0.0]
+
+    def session(i):
+        start_barrier.wait()
+        while time.perf_counter() < deadline[0]:
+            t0 = time.perf_counter()
+            predict(windows[i])
+            latencies[i].append(time.perf_counter() - t0)
+
+    threads = [threading.Thread(target=session, args=(i,)) for i in range(sessions)]
+    for thread in threads:
+        thread.start()
+    deadline[0] = time.perf_counter() + seconds
+    start = time.perf_counter()
+    start_barrier.wait()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    ms = np.concatenate([np.asarray(l) for l in latencies]) * 1000.0
+    return len(ms) / elapsed, float(np.percentile(ms, 50)), float(np.percentile(ms, 95))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cross-session micro-batching load test")
+    parser.add_argument("--model", default=DEFAULT_MODEL)
+    parser.add_argument("--sessions", type=int, nargs="+", default=[1, 2, 4, 8, 16, 32])
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--max-batch", type=int, default=16)
+    parser.add_argument("--max-wait-ms", type=float, default=5.0)
+    args = parser.parse_args()
+
+    if os.path.exists(args.model):
+        from keras.models import load_model
+        model = load_model(args.model)
+        print(f"model: {os.path.abspath(args.model)}")
+    else:
+        model = build_standin_model()
+        print("model: random stand-in (model file not found)")
+    classifier = SignClassifier(model)
+
+    print(f"{'sessions':>8} | {'mode':<8} | {'windows/s':>9} | {'p50 ms':>7} | {'p95 ms':>7} | {'mean batch':>10}")
+    for sessions in args.sessions:
+        rate, p50, p95 = run_sessions(classifier.predict, sessions, args.seconds)
+        print(f"{sessions:>8} | {'direct':<8} | {rate:>9.1f} | {p50:>7.2f} | {p95:>7.2f} | {1:>10}")
+
+        batcher = BatchingClassifier(classifier, max_batch_size=args.max_batch,
+                                     max_wait=args.max_wait_ms / 1000.0)
+        rate, p50, p95 = run_sessions(batcher.predict, sessions, args.seconds)
+        stats = batcher.stats()
+        batcher.close()
+        print(f"{sessions:>8} | {'batched':<8} | {rate:>9.1f} | {p50:>7.2f} | {p95:>7.2f} | "
+              f"{stats['batcher_mean_batch']:>10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+# Benchmark: Keras model.predict vs. SignClassifier direct call
+#
+#   python -m benchmarks.bench_inference [--model pages/best_model_withGPU3.h5]
+#
+# Without a model file a randomly initialised stand-in with the same
+# input/output shape is used, which is enough to compare per-call overhead.
+import argparse
+import os
+import time
+
+import numpy as np
+
+from inference import DEFAULT_MODEL, SignClassifier
+from keypoints import KEYPOINT_SIZE
+from sequence_buffer import SEQUENCE_LENGTH
+
+
+def build_standin_model(num_actions=11, feature_size=KEYPOINT_SIZE):
+    from keras import Input
+    from keras.layers import LSTM, Dense
+    from keras.models import Sequential
+
+    return Sequential([
+        Input((SEQUENCE_LENGTH, feature_size)),
+        LSTM(64, return_sequences=True, activation="relu"),
+        LSTM(128, return_sequences=True, activation="relu"),
+        LSTM(64, return_sequences=False, activation="relu"),
+        Dense(64, activation="relu"),
+        Dense(32, activation="relu"),
+        Dense(num_actions, activation="softmax"),
+    ])
+
+
+def calls_per_second(fn, batch, seconds):
+    fn(batch)
+    calls = 0
+    start = time.perf_counter()
+    while time.perf_counter() - start < seconds:
+        fn(batch)
+        calls += 1
+    return calls / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sign classifier inference benchmark")
+    parser.add_argument("--model", default=DEFAULT_MODEL)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    args = parser.parse_args()
+
+    if os.path.exists(args.model):
+        from keras.models import load_model
+        model = load_model(args.model)
+        print(f"model: {os.path.abspath(args.model)}")
+    else:
+        model = build_standin_model()
+        print("model: random stand-in (model file not found)")
+
+    classifier = SignClassifier(model)
+    print(f"warm-up: {classifier.warmup_seconds * 1000:.1f} ms")
+
+    rng = np.random.default_rng(0)
+    batch = rng.random((1, SEQUENCE_LENGTH, KEYPOINT_SIZE), dtype=np.float32)
+
+    expected = model.predict(batch, verbose=0)
+    got = classifier.predict(batch)
+    print(f"max |predict - direct|: {np.max(np.abs(expected - got)):.3g}")
+    print(f"same argmax: {bool(np.argmax(expected) == np.argmax(got))}")
+
+    legacy = calls_per_second(lambda b: model.predict(b, verbose=0), batch, args.seconds)
+    direct = calls_per_second(classifier.predict, batch, args.seconds)
+    print(f"model.predict:          {legacy:8.1f} calls/s")
+    print(f"SignClassifier.predict: {direct:8.1f} calls/s")
+    print(f"speedup: {direct / legacy:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+# Micro-benchmark: list-based vs. preallocated keypoint extraction
+#
+#   python -m benchmarks.bench_keypoints
+#
+# Uses synthetic Holistic results so it runs without MediaPipe or a webcam.
+import argparse
+import timeit
+import tracemalloc
+
+import numpy as np
+
+from keypoints import (
+    KEYPOINT_SIZE, POSE_LANDMARKS, FACE_LANDMARKS, HAND_LANDMARKS, extract_keypoints,
+)
+
+
+class _Landmark:
+    __slots__ = ("x", "y", "z", "visibility")
+
+    def __init__(self, rng):
+        self.x, self.y, self.z, self.visibility = (float(v) for v in rng.random(4, dtype=np.float32))
+
+
+class _LandmarkList:
+    def __init__(self, rng, count):
+        self.landmark = [_Landmark(rng) for _ in range(count)]
+
+
+class _Results:
+    def __init__(self, rng, hands=True):
+        self.pose_landmarks = _LandmarkList(rng, POSE_LANDMARKS)
+        self.face_landmarks = _LandmarkList(rng, FACE_LANDMARKS)
+        self.left_hand_landmarks = _LandmarkList(rng, HAND_LANDMARKS) if hands else None
+        self.right_hand_landmarks = _LandmarkList(rng, HAND_LANDMARKS)
+
+
+# Original extractor from the pages, kept here as the baseline
+def legacy_extract_keypoints(results):
+    pose = np.array([[res.x, res.y, res.z, res.visibility] for res in results.pose_landmarks.landmark]).flatten() if results.pose_landmarks else np.zeros(33*4)
+    face = np.array([[res.x, res.y, res.z] for res in results.face_landmarks.landmark]).flatten() if results.face_landmarks else np.zeros(468*3)
+    lh = np.array([[res.x, res.y, res.z] for res in results.left_hand_landmarks.landmark]).flatten() if results.left_hand_landmarks else np.zeros(21*3)
+    rh = np.array([[res.x, res.y, res.z] for res in results.right_hand_landmarks.landmark]).flatten() if results.right_hand_landmarks else np.zeros(21*3)
+    return np.concatenate([pose, face, lh, rh])
+
+
+def _peak_bytes(fn):
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Keypoint extraction micro-benchmark")
+    parser.add_argument("--number", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    samples = [_Results(rng), _Results(rng, hands=False)]
+    out = np.empty(KEYPOINT_SIZE, dtype=np.float32)
+
+    for results in samples:
+        expected = legacy_extract_keypoints(results)
+        got = extract_keypoints(results, out)
+        assert got.shape == expected.shape
+        assert np.array_equal(got, expected.astype(np.float32)), "layout mismatch"
+
+    results = samples[0]
+    cases = [
+        ("legacy", lambda: legacy_extract_keypoints(results)),
+        ("preallocated", lambda: extract_keypoints(results, out)),
+    ]
+    print(f"{'extractor':<14}{'us/frame':>10}{'peak alloc':>14}")
+    timings = {}
+    for name, fn in cases:
+        best = min(timeit.repeat(fn, number=args.number, repeat=args.repeat)) / args.number
+        timings[name] = best
+        print(f"{name:<14}{best * 1e6:>10.1f}{_peak_bytes(fn):>12d} B")
+    print(f"speedup: {timings['legacy'] / timings['preallocated']:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
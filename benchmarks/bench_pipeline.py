@@ -0,0 +1,217 @@
+# Per-stage latency benchmark for the sign detection loop
+#
+#   python -m benchmarks.bench_pipeline --video clip.mp4 --output results.json
+#   python -m benchmarks.bench_pipeline --frames 300 --compare baseline.json
+#   python -m benchmarks.bench_pipeline --delivery JPEG --quality 70 --preview-width 480
+#
+# Drives the same stages as the pages from a recorded clip or synthetic
+# frames (no webcam needed) and reports p50/p95/p99 latency and throughput
+# per stage. Results are written as JSON so runs can be compared across
+# commits with --compare.
+import argparse
+import json
+import os
+import platform
+import subprocess
+import time
+
+import cv2
+import numpy as np
+
+from benchmarks.bench_inference import DEFAULT_MODEL, build_standin_model
+from frame_delivery import DELIVERY_FORMATS, FrameDelivery
+from inference import ACTIONS, SignClassifier
+from keypoints import extract_keypoints
+from landmark_engine import LandmarkEngine, display_probabilities, draw_landmarks
+from sequence_buffer import SequenceWindow
+
+STAGES = [
+    "color_convert",
+    "holistic_process",
+    "extract_keypoints",
+    "window_update",
+    "classifier",
+    "overlay",
+    "encode",
+]
+
+
+def synthetic_frames(count, width, height):
+    rng = np.random.default_rng(0)
+    base = rng.integers(0, 255, (height, width, 3), dtype=np.uint8)
+    for i in range(count):
+        yield np.roll(base, i * 4, axis=1)
+
+
+def video_frames(path, count):
+    cap = cv2.VideoCapture(path)
+    if not cap.isOpened():
+        raise IOError(f"Cannot open video: {path}")
+    try:
+        produced = 0
+        while count is None or produced < count:
+            ret, frame = cap.read()
+            if not ret:
+                break
+            produced += 1
+            yield frame
+    finally:
+        cap.release()
+
+
+def summarize(samples):
+    ms = np.asarray(samples) * 1000.0
+    return {
+        "samples": int(ms.size),
+        "mean_ms": round(float(ms.mean()), 4),
+        "p50_ms": round(float(np.percentile(ms, 50)), 4),
+        "p95_ms": round(float(np.percentile(ms, 95)), 4),
+        "p99_ms": round(float(np.percentile(ms, 99)), 4),
+        "throughput_fps": round(float(1000.0 / ms.mean()), 2) if ms.mean() > 0 else None,
+    }
+
+
+def git_revision():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"],
+                                       stderr=subprocess.DEVNULL, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(frames, classifier, engine, delivery=None):
+    timings = {stage: [] for stage in STAGES}
+    window = SequenceWindow()
+    detected = 0
+    count = 0
+    encoded_bytes = 0
+    clock = time.perf_counter
+
+    for frame in frames:
+        count += 1
+        t0 = clock()
+        rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+        rgb.flags.writeable = False
+        t1 = clock()
+        results = engine.holistic.process(rgb)
+        t2 = clock()
+        extract_keypoints(results, window.next_row())
+        t3 = clock()
+        window.commit()
+        t4 = clock()
+        timings["color_convert"].append(t1 - t0)
+        timings["holistic_process"].append(t2 - t1)
+        timings["extract_keypoints"].append(t3 - t2)
+        timings["window_update"].append(t4 - t3)
+        if results.left_hand_landmarks or results.right_hand_landmarks:
+            detected += 1
+
+        res = None
+        if window.is_full():
+            t5 = clock()
+            res = classifier.predict(window.batch())[0]
+            timings["classifier"].append(clock() - t5)
+
+        image = frame
+        t6 = clock()
+        draw_landmarks(image, results)
+        if res is not None:
+            display_probabilities(image, res, ACTIONS)
+        t7 = clock()
+        if delivery is None or delivery.fmt == "Raw":
+            # What st.image does with a BGR array
+            encoded_bytes += len(cv2.imencode(".png", image)[1])
+        else:
+            encoded_bytes += len(delivery.encode(image))
+        t8 = clock()
+        timings["overlay"].append(t7 - t6)
+        timings["encode"].append(t8 - t7)
+
+    stages = {stage: summarize(samples) for stage, samples in timings.items() if samples}
+    return stages, count, detected, encoded_bytes // max(count, 1)
+
+
+def compare(current, baseline):
+    print(f"\n{'stage':<20}{'p50 base':>10}{'p50 now':>10}{'delta':>9}")
+    for stage, stats in current.items():
+        base = baseline.get("stages", {}).get(stage)
+        if not base:
+            continue
+        delta = (stats["p50_ms"] - base["p50_ms"]) / base["p50_ms"] * 100 if base["p50_ms"] else 0.0
+        print(f"{stage:<20}{base['p50_ms']:>10.3f}{stats['p50_ms']:>10.3f}{delta:>+8.1f}%")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-stage latency benchmark for the detection loop")
+    parser.add_argument("--video", help="recorded clip to use instead of synthetic frames")
+    parser.add_argument("--frames", type=int, default=300)
+    parser.add_argument("--width", type=int, default=640)
+    parser.add_argument("--height", type=int, default=480)
+    parser.add_argument("--model", default=DEFAULT_MODEL)
+    parser.add_argument("--delivery", choices=DELIVERY_FORMATS, default="Raw",
+                        help="preview encoding for the encode stage (Raw = lossless PNG, as st.image)")
+    parser.add_argument("--quality", type=int, default=75)
+    parser.add_argument("--preview-width", type=int, default=640)
+    parser.add_argument("--output", default=os.path.join("benchmarks", "results", "pipeline.json"))
+    parser.add_argument("--compare", help="earlier results JSON to diff against")
+    args = parser.parse_args()
+
+    if os.path.exists(args.model):
+        classifier = SignClassifier.load(args.model)
+        model_name = os.path.abspath(args.model)
+    else:
+        classifier = SignClassifier(build_standin_model(len(ACTIONS)))
+        model_name = "random stand-in"
+    engine = LandmarkEngine()
+
+    if args.video:
+        frames = video_frames(args.video, args.frames)
+        source = os.path.abspath(args.video)
+    else:
+        frames = synthetic_frames(args.frames, args.width, args.height)
+        source = f"synthetic {args.width}x{args.height}"
+
+    start = time.perf_counter()
+    delivery = FrameDelivery(args.delivery, args.quality, args.preview_width)
+    stages, count, detected, bytes_per_frame = run(frames, classifier, engine, delivery)
+    wall = time.perf_counter() - start
+    engine.close()
+
+    report = {
+        "meta": {
+            "revision": git_revision(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "processor": platform.processor(),
+            "source": source,
+            "model": model_name,
+            "frames": count,
+            "frames_with_hands": detected,
+            "delivery": f"{args.delivery} q{args.quality} {args.preview_width}px" if args.delivery != "Raw" else "Raw",
+            "bytes_per_frame": bytes_per_frame,
+            "wall_seconds": round(wall, 3),
+            "end_to_end_fps": round(count / wall, 2) if wall > 0 else None,
+        },
+        "stages": stages,
+    }
+
+    print(f"{'stage':<20}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'fps':>10}")
+    for stage, stats in stages.items():
+        print(f"{stage:<20}{stats['p50_ms']:>9.3f}{stats['p95_ms']:>9.3f}{stats['p99_ms']:>9.3f}"
+              f"{stats['throughput_fps']:>10.1f}")
+    print(f"end-to-end: {report['meta']['end_to_end_fps']} fps over {count} frames")
+    print(f"preview: {report['meta']['delivery']}, {bytes_per_frame / 1024:.1f} KiB/frame")
+
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"wrote {args.output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            compare(stages, json.load(f))
+
+
+if __name__ == "__main__":
+    main()
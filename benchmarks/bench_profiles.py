@@ -0,0 +1,165 @@
+# FPS / accuracy table for the Holistic performance profiles and feature layouts
+#
+#   python -m benchmarks.bench_profiles --video clip.mp4
+#   python -m benchmarks.bench_profiles --labelled clips/ --output profiles.json
+#
+# For every profile in landmark_engine.PROFILES, runs Holistic over the
+# frames and times landmarking, keypoint extraction and the classifier for
+# each feature layout. With --labelled (one sub-directory per action, each
+# holding clips of that sign) it also reports top-1 accuracy of the
+# classifier on the last window of every clip. Layouts whose model file is
+# missing under pages/ are timed with a random stand-in and get no
+# accuracy.
+import argparse
+import json
+import os
+import time
+
+import numpy as np
+
+from benchmarks.bench_inference import build_standin_model
+from benchmarks.bench_pipeline import git_revision, synthetic_frames, video_frames
+from inference import ACTIONS, MODEL_FILES, SignClassifier
+from keypoints import FEATURE_LAYOUTS, extract_keypoints, get_extractor, to_hands_pose
+from landmark_engine import PROFILES, LandmarkEngine
+from sequence_buffer import SEQUENCE_LENGTH
+from transcribe import VIDEO_EXTENSIONS
+
+PAGES_DIR = os.path.join(os.path.dirname(__file__), "..", "pages")
+
+
+def load_classifiers():
+    classifiers = {}
+    for layout, filename in MODEL_FILES.items():
+        path = os.path.join(PAGES_DIR, filename)
+        if os.path.exists(path):
+            classifiers[layout] = (SignClassifier.load(path), True)
+        else:
+            classifiers[layout] = (SignClassifier(build_standin_model(len(ACTIONS), FEATURE_LAYOUTS[layout])), False)
+    return classifiers
+
+
+def labelled_clips(root):
+    clips = []
+    for action in sorted(os.listdir(root)):
+        folder = os.path.join(root, action)
+        if action not in ACTIONS or not os.path.isdir(folder):
+            continue
+        clips.extend((os.path.join(folder, name), int(np.flatnonzero(ACTIONS == action)[0]))
+                     for name in sorted(os.listdir(folder)) if name.lower().endswith(VIDEO_EXTENSIONS))
+    return clips
+
+
+def run_profile(profile, frames):
+    """Landmark every frame; return (full-layout rows, timings in seconds, frames with hands)."""
+    engine = LandmarkEngine(profile=profile)
+    timings = {"landmark": [], **{f"extract_{layout}": [] for layout in FEATURE_LAYOUTS}}
+    rows = []
+    with_hands = 0
+    for frame in frames:
+        t0 = time.perf_counter()
+        results = engine.process(frame)
+        timings["landmark"].append(time.perf_counter() - t0)
+        for layout in FEATURE_LAYOUTS:
+            t0 = time.perf_counter()
+            get_extractor(layout)(results)
+            timings[f"extract_{layout}"].append(time.perf_counter() - t0)
+        rows.append(extract_keypoints(results))
+        if results.left_hand_landmarks or results.right_hand_landmarks:
+            with_hands += 1
+    engine.close()
+    return np.asarray(rows, dtype=np.float32), timings, with_hands
+
+
+def classify_ms(classifier, repeats=50):
+    batch = np.zeros((1, classifier.sequence_length, classifier.feature_size), dtype=np.float32)
+    classifier.predict(batch)
+    start = time.perf_counter()
+    for _ in range(repeats):
+        classifier.predict(batch)
+    return (time.perf_counter() - start) / repeats * 1000.0
+
+
+def last_window(rows, layout):
+    if len(rows) < SEQUENCE_LENGTH:
+        return None
+    window = rows[-SEQUENCE_LENGTH:]
+    return (to_hands_pose(window) if layout == "hands_pose" else window)[np.newaxis]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Holistic profile / feature layout FPS and accuracy table")
+    parser.add_argument("--video", help="clip to time the profiles on (default: synthetic frames)")
+    parser.add_argument("--labelled", help="directory with one sub-directory of clips per action")
+    parser.add_argument("--profiles", nargs="+", choices=list(PROFILES), default=list(PROFILES))
+    parser.add_argument("--frames", type=int, default=300)
+    parser.add_argument("--width", type=int, default=640)
+    parser.add_argument("--height", type=int, default=480)
+    parser.add_argument("--output", default=os.path.join("benchmarks", "results", "profiles.json"))
+    args = parser.parse_args()
+
+    classifiers = load_classifiers()
+    classifier_ms = {layout: classify_ms(c) for layout, (c, _) in classifiers.items()}
+    clips = labelled_clips(args.labelled) if args.labelled else []
+
+    rows_out = []
+    for profile in args.profiles:
+        if args.video:
+            frames = video_frames(args.video, args.frames)
+        else:
+            frames = synthetic_frames(args.frames, args.width, args.height)
+        _, timings, with_hands = run_profile(profile, frames)
+        frame_count = len(timings["landmark"])
+        landmark_ms = float(np.mean(timings["landmark"])) * 1000.0
+
+        correct = dict.fromkeys(FEATURE_LAYOUTS, 0)
+        scored = 0
+        for path, label in clips:
+            clip_rows, _, _ = run_profile(profile, video_frames(path, None))
+            scored += 1
+            for layout, (classifier, real) in classifiers.items():
+                window = last_window(clip_rows, layout)
+                if real and window is not None and int(np.argmax(classifier.predict(window)[0])) == label:
+                    correct[layout] += 1
+
+        for layout, (classifier, real) in classifiers.items():
+            extract_ms = float(np.mean(timings[f"extract_{layout}"])) * 1000.0
+            total_ms = landmark_ms + extract_ms + classifier_ms[layout]
+            rows_out.append({
+                "profile": profile,
+                "layout": layout,
+                **PROFILES[profile],
+                "landmark_ms": round(landmark_ms, 3),
+                "extract_ms": round(extract_ms, 4),
+                "classifier_ms": round(classifier_ms[layout], 3),
+                "fps": round(1000.0 / total_ms, 2),
+                "hand_detection_rate": round(with_hands / max(frame_count, 1), 3),
+                "model": MODEL_FILES[layout] if real else "random stand-in",
+                "accuracy": round(correct[layout] / scored, 3) if real and scored else None,
+            })
+
+    print("| profile | layout | complexity | refine face | smooth | landmark ms | fps | hands | accuracy |")
+    print("|---|---|---|---|---|---|---|---|---|")
+    for row in rows_out:
+        accuracy = "n/a" if row["accuracy"] is None else f"{row['accuracy']:.1%}"
+        print(f"| {row['profile']} | {row['layout']} | {row['model_complexity']} | {row['refine_face_landmarks']} "
+              f"| {row['smooth_landmarks']} | {row['landmark_ms']:.1f} | {row['fps']:.1f} "
+              f"| {row['hand_detection_rate']:.0%} | {accuracy} |")
+
+    report = {
+        "meta": {
+            "revision": git_revision(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "source": os.path.abspath(args.video) if args.video else f"synthetic {args.width}x{args.height}",
+            "labelled_clips": len(clips),
+        },
+        "rows": rows_out,
+    }
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"wrote {args.output}")
+
+
+if __name__ == "__main__":
+    main()
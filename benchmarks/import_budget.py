@@ -0,0 +1,94 @@
+# Import-time report and budget check for the auth pages
+#
+#   python -m benchmarks.import_budget [--budget-ms 1500] [--json report.json]
+#
+# For each page that must render instantly on a cold worker, imports the
+# modules that page imports, in a fresh interpreter with -X importtime,
+# and reports the cumulative cost. Exits non-zero if a page goes over the
+# budget or pulls in any of HEAVY_MODULES, so it can gate CI.
+import argparse
+import ast
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+AUTH_PAGES = ["app.py", "pages/signup.py", "pages/login.py", "pages/home.py", "pages/aboutus.py"]
+HEAVY_MODULES = ["tensorflow", "keras", "mediapipe", "cv2", "firebase_admin", "vosk", "sounddevice", "pyttsx3"]
+
+
+def page_imports(path):
+    with open(os.path.join(ROOT, path), encoding="utf-8") as f:
+        tree = ast.parse(f.read(), path)
+    modules = []
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            modules.extend(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.module and node.level == 0:
+            modules.append(node.module)
+    return sorted(set(modules))
+
+
+def measure(modules):
+    code = "\n".join(f"import {name}" for name in modules)
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", code],
+                          cwd=ROOT, capture_output=True, text=True)
+    imported = {}
+    total_us = 0
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        # "import time: <self us> | <cumulative us> | <indented module name>"
+        _, cumulative_us, name = line.split(":", 1)[1].split("|")
+        imported[name.strip()] = int(cumulative_us)
+        # Top-level imports are indented by exactly one space
+        if not name.startswith("  "):
+            total_us += int(cumulative_us)
+    error = proc.stderr.strip().splitlines()[-1] if proc.returncode else None
+    return total_us, imported, error
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Import-time budget check for the auth pages")
+    parser.add_argument("--budget-ms", type=float, default=1500.0)
+    parser.add_argument("--top", type=int, default=5)
+    parser.add_argument("--json", help="write the report to this file")
+    args = parser.parse_args()
+
+    report = {"budget_ms": args.budget_ms, "pages": {}}
+    failed = False
+    for page in AUTH_PAGES:
+        modules = page_imports(page)
+        total_us, imported, error = measure(modules)
+        heavy = sorted({name.split(".")[0] for name in imported} & set(HEAVY_MODULES))
+        top = sorted(((imported.get(m, 0), m) for m in modules), reverse=True)[:args.top]
+        over = total_us / 1000 > args.budget_ms
+        page_failed = bool(error or heavy or over)
+        failed |= page_failed
+        report["pages"][page] = {
+            "import_ms": round(total_us / 1000, 1),
+            "modules": modules,
+            "slowest": [{"module": m, "ms": round(us / 1000, 1)} for us, m in top],
+            "heavy_modules": heavy,
+            "error": error,
+            "ok": not page_failed,
+        }
+        status = "FAIL" if page_failed else "ok"
+        print(f"{status:<5}{page:<20}{total_us / 1000:>9.1f} ms")
+        for us, m in top:
+            print(f"       {m:<40}{us / 1000:>9.1f} ms")
+        if heavy:
+            print(f"       heavy modules imported: {', '.join(heavy)}")
+        if error:
+            print(f"       import failed: {error}")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
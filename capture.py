@@ -0,0 +1,104 @@
+import logging
+import time
+
+from config import load_config
+
+logger = logging.getLogger(__name__)
+
+# "source" is a camera index or a video file standing in for the camera.
+# "inference_width" is the width frames are shrunk to before Holistic
+# (None = full size); "realtime" paces file sources at their own FPS and
+# "loop" restarts them at the end.
+DEFAULT_CAPTURE = {
+    "source": 0,
+    "width": 640,
+    "height": 480,
+    "fps": 30,
+    "buffer_size": 1,
+    "inference_width": None,
+    "realtime": True,
+    "loop": False,
+}
+RESOLUTIONS = ["320x240", "640x480", "960x540", "1280x720", "1920x1080"]
+INFERENCE_WIDTHS = [256, 320, 480, 640, "Full"]
+
+
+def load_capture_config(path=None):
+    return load_config("capture", DEFAULT_CAPTURE, path)
+
+
+# Camera or video file behind one read()/release() interface
+class CaptureSource:
+    """Opens ``source`` and applies the requested capture properties.
+
+    For cameras, resolution, FPS and buffer size are requested through
+    CAP_PROP_*; drivers may round or ignore them, so what was actually
+    granted is kept in ``actual``. A small buffer keeps the pipeline on
+    the newest frame instead of draining stale ones. Video files are read
+    at their recorded FPS when ``realtime`` is set, so a clip behaves like
+    a live camera in the pipeline, and rewind at the end when ``loop`` is
+    set.
+    """
+
+    def __init__(self, source=0, width=640, height=480, fps=30, buffer_size=1, realtime=True, loop=False):
+        import cv2
+
+        if isinstance(source, str) and source.isdigit():
+            source = int(source)
+        self.source = source
+        self.is_file = not isinstance(source, int)
+        self.loop = loop
+        self.cap = cv2.VideoCapture(source)
+        if not self.is_file:
+            self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, width)
+            self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, height)
+            self.cap.set(cv2.CAP_PROP_FPS, fps)
+            self.cap.set(cv2.CAP_PROP_BUFFERSIZE, buffer_size)
+        self.actual = {
+            "width": int(self.cap.get(cv2.CAP_PROP_FRAME_WIDTH)),
+            "height": int(self.cap.get(cv2.CAP_PROP_FRAME_HEIGHT)),
+            "fps": self.cap.get(cv2.CAP_PROP_FPS),
+        }
+        self._interval = 1.0 / self.actual["fps"] if self.is_file and realtime and self.actual["fps"] > 0 else 0.0
+        self._next_frame = 0.0
+        if self.cap.isOpened():
+            logger.info("Capture %s opened at %dx%d, %.1f fps", source, self.actual["width"],
+                        self.actual["height"], self.actual["fps"])
+
+    def isOpened(self):
+        return self.cap.isOpened()
+
+    def read(self):
+        import cv2
+
+        if self._interval:
+            delay = self._next_frame - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            self._next_frame = max(self._next_frame, time.perf_counter()) + self._interval
+        ret, frame = self.cap.read()
+        if not ret and self.is_file and self.loop:
+            self.cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+            ret, frame = self.cap.read()
+        return ret, frame
+
+    def release(self):
+        self.cap.release()
+
+
+def choices(options, current):
+    """Return (options, index of current) for a sidebar widget, adding current if missing."""
+    options = options if current in options else [current] + options
+    return options, options.index(current)
+
+
+def apply_sidebar(config, resolution, fps, inference_width):
+    """Overlay the sidebar's capture settings on the file config."""
+    width, height = (int(v) for v in resolution.split("x"))
+    return dict(config, width=width, height=height, fps=fps,
+                inference_width=None if inference_width == "Full" else inference_width)
+
+
+def open_capture(config):
+    return CaptureSource(config["source"], config["width"], config["height"], config["fps"],
+                         config["buffer_size"], config["realtime"], config["loop"])
@@ -0,0 +1,83 @@
+from collections import deque
+from datetime import datetime, timedelta
+
+import streamlit as st
+
+DEFAULT_RENDER_LIMIT = 20
+
+
+# Incremental reader for the Firestore "chat" collection
+class ChatSync:
+    """Keeps a local, ordered cache of chat messages and fetches only new ones.
+
+    The first ``sync`` reads the newest ``cache_size`` documents. Later
+    calls re-query from ``margin_seconds`` before the newest timestamp
+    seen, so a document committed late with an earlier timestamp (client
+    clock skew, a delayed or retried write) is still picked up. Documents
+    already seen are skipped by id, using the last ``seen_size`` ids.
+    Works with any Firestore collection reference, including one backed
+    by the emulator (set FIRESTORE_EMULATOR_HOST before firebase_admin is
+    initialised).
+    """
+
+    def __init__(self, collection, cache_size=200, margin_seconds=120, seen_size=1000):
+        self.collection = collection
+        self.messages = deque(maxlen=cache_size)
+        self.margin_seconds = margin_seconds
+        self.reads = 0
+        self._last_timestamp = None
+        self._seen = deque(maxlen=seen_size)
+        self._seen_ids = set()
+
+    def _cursor(self):
+        if isinstance(self._last_timestamp, datetime):
+            return self._last_timestamp - timedelta(seconds=self.margin_seconds)
+        return self._last_timestamp - self.margin_seconds
+
+    def _remember(self, doc_id):
+        if len(self._seen) == self._seen.maxlen:
+            self._seen_ids.discard(self._seen[0])
+        self._seen.append(doc_id)
+        self._seen_ids.add(doc_id)
+
+    def sync(self):
+        """Fetch messages not seen yet; return how many were added."""
+        if self._last_timestamp is None:
+            query = self.collection.order_by("timestamp", direction="DESCENDING").limit(self.messages.maxlen)
+            docs = list(query.stream())[::-1]
+        else:
+            query = self.collection.order_by("timestamp").start_at({"timestamp": self._cursor()})
+            docs = list(query.stream())
+        self.reads += len(docs)
+        added = 0
+        late = False
+        for doc in docs:
+            if doc.id in self._seen_ids:
+                continue
+            self._remember(doc.id)
+            data = doc.to_dict()
+            timestamp = data.get("timestamp")
+            if self._last_timestamp is None or timestamp > self._last_timestamp:
+                self._last_timestamp = timestamp
+            elif self.messages and timestamp < self.messages[-1].get("timestamp"):
+                late = True
+            self.messages.append(data)
+            added += 1
+        if late:
+            # Put late arrivals back in timestamp order
+            self.messages = deque(sorted(self.messages, key=lambda m: m.get("timestamp")),
+                                  maxlen=self.messages.maxlen)
+        return added
+
+    def recent(self, sender=None, limit=DEFAULT_RENDER_LIMIT):
+        messages = [m for m in self.messages if sender is None or m.get("sender") == sender]
+        return messages[-limit:]
+
+
+# One sync cursor per Streamlit session
+def get_session_chat_sync(collection):
+    chat = st.session_state.get("chat_sync")
+    if chat is None:
+        chat = ChatSync(collection)
+        st.session_state.chat_sync = chat
+    return chat
@@ -0,0 +1,142 @@
+import atexit
+import logging
+import queue
+import threading
+import time
+from collections import deque
+
+logger = logging.getLogger(__name__)
+
+# Firestore rejects batches with more than 500 writes
+MAX_BATCH_WRITES = 500
+
+
+# Write-behind queue for chat messages
+class ChatWriter:
+    """Persists chat messages from a background thread in Firestore batches.
+
+    ``add`` only enqueues. The writer commits a batch once ``max_batch``
+    messages are waiting or the oldest has waited ``flush_interval``
+    seconds. A failed commit is retried with exponential backoff (capped at
+    ``max_backoff``), so transient errors only delay messages. A batch
+    still failing after ``max_attempts`` is logged and moved to
+    ``dead_letters`` (the last ``dead_letter_size`` messages), so one
+    batch that can never be written does not hold up every later one. On
+    interpreter exit ``close`` gives pending messages up to ``timeout``
+    seconds to flush.
+    """
+
+    def __init__(self, db, collection="chat", max_batch=20, flush_interval=1.0,
+                 backoff=0.5, max_backoff=30.0, max_attempts=8, dead_letter_size=100):
+        self.db = db
+        self.collection = collection
+        self.max_batch = min(max_batch, MAX_BATCH_WRITES)
+        self.flush_interval = flush_interval
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.max_attempts = max_attempts
+        self.written = 0
+        self.batches = 0
+        self.failures = 0
+        self.dead_lettered = 0
+        self.dead_letters = deque(maxlen=dead_letter_size)
+        self.last_flush_seconds = None
+        self._queue = queue.Queue()
+        self._pending = []
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="chat-writer", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def add(self, message):
+        self._queue.put(message)
+
+    def stats(self):
+        stats = {
+            "chat_writer_queued": self._queue.qsize(),
+            "chat_writer_pending": len(self._pending),
+            "chat_writer_written": self.written,
+            "chat_writer_batches": self.batches,
+            "chat_writer_failures": self.failures,
+            "chat_writer_dead_lettered": self.dead_lettered,
+        }
+        # No latency until the first batch has been committed
+        if self.last_flush_seconds is not None:
+            stats["chat_writer_last_flush_ms"] = round(self.last_flush_seconds * 1000, 3)
+        return stats
+
+    def close(self, timeout=10.0):
+        self._stop.set()
+        self._thread.join(timeout)
+
+    def _commit(self, messages):
+        start = time.perf_counter()
+        batch = self.db.batch()
+        collection = self.db.collection(self.collection)
+        for message in messages:
+            batch.set(collection.document(), message)
+        batch.commit()
+        self.last_flush_seconds = time.perf_counter() - start
+        self.written += len(messages)
+        self.batches += 1
+
+    def _flush(self):
+        delay = self.backoff
+        attempts = 0
+        while self._pending:
+            messages = self._pending[:self.max_batch]
+            try:
+                self._commit(messages)
+            except Exception:
+                self.failures += 1
+                attempts += 1
+                if attempts >= self.max_attempts:
+                    logger.error("Chat batch write failed %d times; dropping %d message(s): %r",
+                                 attempts, len(messages), messages, exc_info=True)
+                    self.dead_letters.extend(messages)
+                    self.dead_lettered += len(messages)
+                else:
+                    logger.warning("Chat batch write failed, retrying in %.1fs", delay, exc_info=True)
+                    time.sleep(delay)
+                    delay = min(delay * 2, self.max_backoff)
+                    continue
+            del self._pending[:len(messages)]
+            delay = self.backoff
+            attempts = 0
+
+    def _drain(self):
+        while len(self._pending) < self.max_batch:
+            try:
+                self._pending.append(self._queue.get_nowait())
+            except queue.Empty:
+                return
+
+    def _run(self):
+        oldest = None
+        while not (self._stop.is_set() and self._queue.empty() and not self._pending):
+            try:
+                self._pending.append(self._queue.get(timeout=0.1))
+            except queue.Empty:
+                pass
+            self._drain()
+            if not self._pending:
+                continue
+            if oldest is None:
+                oldest = time.monotonic()
+            full = len(self._pending) >= self.max_batch
+            if full or time.monotonic() - oldest >= self.flush_interval or self._stop.is_set():
+                self._flush()
+                oldest = None
+
+
+_writer = None
+_writer_lock = threading.Lock()
+
+
+# Process-wide writer, so it survives Streamlit reruns and is shared by sessions
+def get_chat_writer(db):
+    global _writer
+    with _writer_lock:
+        if _writer is None:
+            _writer = ChatWriter(db)
+        return _writer
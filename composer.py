@@ -0,0 +1,102 @@
+import time
+
+# Phrase grammar over the classifier's vocabulary (see inference.ACTIONS).
+# Each entry maps a run of signs to a clause; "sentence" clauses can stand
+# alone, "fragment" ones need the LLM to be turned into a real sentence.
+PHRASES = {
+    ("hello",): ("Hello", "greeting"),
+    ("hello", "mandar"): ("Hello, I am Mandar", "sentence"),
+    ("hello", "i", "mandar"): ("Hello, I am Mandar", "sentence"),
+    ("my", "name", "mandar"): ("My name is Mandar", "sentence"),
+    ("name", "mandar"): ("My name is Mandar", "sentence"),
+    ("my", "name", "i", "mandar"): ("My name is Mandar", "sentence"),
+    ("i", "mandar"): ("I am Mandar", "sentence"),
+    ("i", "computer"): ("I work with computers", "sentence"),
+    ("i", "internet"): ("I use the internet", "sentence"),
+    ("i", "data-entry"): ("I do data entry", "sentence"),
+    ("i", "computer", "data-entry"): ("I do computer data entry", "sentence"),
+    ("i", "data-entry", "computer"): ("I do data entry on a computer", "sentence"),
+    ("i", "language"): ("I know sign language", "sentence"),
+    ("my", "language"): ("Sign language is my language", "sentence"),
+    ("i", "one"): ("I am the one", "sentence"),
+    ("please",): ("please", "please"),
+    ("mandar",): ("Mandar", "fragment"),
+    ("my",): ("my", "fragment"),
+    ("name",): ("name", "fragment"),
+    ("i",): ("I", "fragment"),
+    ("language",): ("language", "fragment"),
+    ("internet",): ("internet", "fragment"),
+    ("computer",): ("computer", "fragment"),
+    ("data-entry",): ("data entry", "fragment"),
+    ("one",): ("one", "fragment"),
+}
+MAX_PHRASE = max(len(phrase) for phrase in PHRASES)
+
+
+class Composition:
+    def __init__(self, text, complete, seconds):
+        self.text = text
+        # True when every sign was covered by a full clause
+        self.complete = complete
+        self.seconds = seconds
+
+
+def _segment(words):
+    i = 0
+    while i < len(words):
+        for size in range(min(MAX_PHRASE, len(words) - i), 0, -1):
+            phrase = tuple(words[i:i + size])
+            if phrase in PHRASES:
+                yield PHRASES[phrase]
+                i += size
+                break
+        else:
+            yield words[i], "unknown"
+            i += 1
+
+
+def _sentence(text, end="."):
+    return text[:1].upper() + text[1:] + end
+
+
+# Rule-based sentence composer
+def compose(words):
+    """Turn a sign sequence into sentences using PHRASES, without any LLM.
+
+    Clauses are matched greedily (longest phrase first). A "please"
+    attaches to the clause before it, or to the next one if it comes first.
+    Anything that is not a full clause is still emitted in order, but the
+    result is marked incomplete.
+    """
+    start = time.perf_counter()
+    words = [w.lower() for w in words]
+    sentences = []
+    fragments = []
+    complete = bool(words)
+    pending_please = False
+
+    def flush_fragments():
+        if fragments:
+            sentences.append(_sentence(" ".join(fragments)))
+            del fragments[:]
+
+    for text, kind in _segment(words):
+        if kind == "please":
+            if sentences and not fragments:
+                sentences[-1] = sentences[-1][:-1] + ", please."
+            else:
+                pending_please = True
+            continue
+        if kind in ("fragment", "unknown"):
+            complete = False
+            fragments.append(text)
+            continue
+        flush_fragments()
+        if pending_please:
+            text = "Please, " + (text if text.startswith("I ") else text[:1].lower() + text[1:])
+            pending_please = False
+        sentences.append(_sentence(text, "!" if kind == "greeting" else "."))
+    flush_fragments()
+    if pending_please:
+        sentences.append("Please.")
+    return Composition(" ".join(sentences), complete, time.perf_counter() - start)
@@ -0,0 +1,27 @@
+import json
+import logging
+import os
+
+logger = logging.getLogger(__name__)
+
+# Optional JSON file with one object per section, e.g. {"capture": {...}}.
+# Missing file or keys fall back to the defaults given by each caller.
+CONFIG_PATH = os.environ.get(
+    "SIGNLANG_CONFIG",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "app_config.json"),
+)
+
+
+def load_config(section, defaults, path=None):
+    """Return ``defaults`` overlaid with ``section`` of the config file."""
+    path = path or CONFIG_PATH
+    values = dict(defaults)
+    if not os.path.exists(path):
+        return values
+    with open(path) as f:
+        overrides = json.load(f).get(section, {})
+    unknown = set(overrides) - set(defaults)
+    if unknown:
+        logger.warning("Ignoring unknown %s settings in %s: %s", section, path, ", ".join(sorted(unknown)))
+    values.update((k, v) for k, v in overrides.items() if k in defaults)
+    return values
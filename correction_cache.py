@@ -0,0 +1,102 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+DEFAULT_CACHE_PATH = os.environ.get(
+    "CORRECTION_CACHE_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), ".correction_cache.sqlite3"),
+)
+
+
+def normalize_words(text):
+    return " ".join(text.lower().split())
+
+
+def cache_key(text, model, prompt_version):
+    raw = "\x1f".join([normalize_words(text), model, prompt_version])
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+# Two-tier memo of grammar corrections: in-memory LRU over SQLite
+class CorrectionCache:
+    """Maps (normalized words, model, prompt version) to a corrected sentence.
+
+    Lookups try the in-process LRU first, then SQLite; disk hits are
+    promoted into memory. Each tier keeps at most its configured number of
+    entries: the LRU drops its least recently used entry, SQLite deletes the
+    least recently used rows down to 90% of ``max_rows``.
+    """
+
+    def __init__(self, path=DEFAULT_CACHE_PATH, memory_size=1024, max_rows=50000):
+        self.path = path
+        self.memory_size = memory_size
+        self.max_rows = max_rows
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS corrections ("
+            " key TEXT PRIMARY KEY, corrected TEXT NOT NULL, last_used REAL NOT NULL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS corrections_last_used ON corrections(last_used)")
+        self._db.commit()
+
+    def _remember(self, key, value):
+        self._memory[key] = value
+        self._memory.move_to_end(key)
+        if len(self._memory) > self.memory_size:
+            self._memory.popitem(last=False)
+
+    def get(self, key):
+        with self._lock:
+            value = self._memory.get(key)
+            if value is not None:
+                self._memory.move_to_end(key)
+                self.memory_hits += 1
+                return value
+            row = self._db.execute("SELECT corrected FROM corrections WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self._db.execute("UPDATE corrections SET last_used = ? WHERE key = ?", (time.time(), key))
+            self._db.commit()
+            self.disk_hits += 1
+            self._remember(key, row[0])
+            return row[0]
+
+    def put(self, key, value):
+        with self._lock:
+            self._remember(key, value)
+            self._db.execute(
+                "INSERT OR REPLACE INTO corrections (key, corrected, last_used) VALUES (?, ?, ?)",
+                (key, value, time.time()),
+            )
+            (rows,) = self._db.execute("SELECT COUNT(*) FROM corrections").fetchone()
+            if rows > self.max_rows:
+                self._db.execute(
+                    "DELETE FROM corrections WHERE key IN ("
+                    " SELECT key FROM corrections ORDER BY last_used ASC LIMIT ?)",
+                    (rows - int(self.max_rows * 0.9),),
+                )
+            self._db.commit()
+
+    def stats(self):
+        with self._lock:
+            (rows,) = self._db.execute("SELECT COUNT(*) FROM corrections").fetchone()
+        lookups = self.memory_hits + self.disk_hits + self.misses
+        return {
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": (self.memory_hits + self.disk_hits) / lookups if lookups else 0.0,
+            "memory_entries": len(self._memory),
+            "disk_entries": rows,
+        }
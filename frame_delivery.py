@@ -0,0 +1,117 @@
+import base64
+import time
+from collections import deque
+
+import numpy as np
+import streamlit as st
+
+# "Raw" is the previous behaviour: hand the BGR array to st.image, which
+# converts and re-encodes it itself
+DELIVERY_FORMATS = ["JPEG", "WebP", "Raw"]
+PREVIEW_WIDTHS = [320, 480, 640, 960, "Full"]
+
+
+# Browser-side delivery of annotated frames
+class FrameDelivery:
+    """Encodes preview frames once, at a capped display rate.
+
+    ``due()`` says whether the next frame should be shown at all: frames
+    arriving faster than ``max_fps`` are skipped before any overlay or
+    encoding work is done. Shown frames are downscaled to ``max_width``
+    and encoded to JPEG or WebP at ``quality``. JPEG bytes go through
+    st.image untouched (Streamlit passes JPEG no wider than the column
+    through without re-encoding); WebP, which st.image would re-encode, is
+    sent as an inline image instead.
+    """
+
+    def __init__(self, fmt="JPEG", quality=75, max_width=640, max_fps=15.0, window=300):
+        self.fmt = fmt
+        self.quality = quality
+        self.max_width = max_width
+        self.max_fps = max_fps
+        self.shown = 0
+        self.skipped = 0
+        self._bytes = deque(maxlen=window)
+        self._encode_seconds = deque(maxlen=window)
+        self._shown_at = deque(maxlen=window)
+        self._last_shown = 0.0
+
+    def due(self, now=None):
+        now = time.perf_counter() if now is None else now
+        if self.max_fps and now - self._last_shown < 1.0 / self.max_fps:
+            self.skipped += 1
+            return False
+        self._last_shown = now
+        return True
+
+    def resize(self, image):
+        import cv2
+
+        height, width = image.shape[:2]
+        if not self.max_width or width <= self.max_width:
+            return image
+        scale = self.max_width / width
+        return cv2.resize(image, (self.max_width, round(height * scale)), interpolation=cv2.INTER_AREA)
+
+    def encode(self, image):
+        """Return the downscaled BGR ``image`` encoded as ``fmt`` bytes."""
+        import cv2
+
+        if self.fmt == "WebP":
+            ok, data = cv2.imencode(".webp", self.resize(image), [cv2.IMWRITE_WEBP_QUALITY, int(self.quality)])
+        else:
+            ok, data = cv2.imencode(".jpg", self.resize(image), [cv2.IMWRITE_JPEG_QUALITY, int(self.quality)])
+        if not ok:
+            raise ValueError(f"Could not encode frame as {self.fmt}")
+        return data.tobytes()
+
+    def show(self, placeholder, image):
+        start = time.perf_counter()
+        if self.fmt == "Raw":
+            # Size is whatever Streamlit's own encoder produces; not visible here
+            placeholder.image(image, channels="BGR")
+            size = None
+        else:
+            data = self.encode(image)
+            size = len(data)
+            if self.fmt == "WebP":
+                encoded = base64.b64encode(data).decode("ascii")
+                placeholder.markdown(f'<img src="data:image/webp;base64,{encoded}" style="width:100%">',
+                                     unsafe_allow_html=True)
+            else:
+                placeholder.image(data, output_format="JPEG")
+        self._encode_seconds.append(time.perf_counter() - start)
+        if size is not None:
+            self._bytes.append(size)
+        self._shown_at.append(time.perf_counter())
+        self.shown += 1
+
+    def display_fps(self):
+        if len(self._shown_at) < 2:
+            return 0.0
+        span = self._shown_at[-1] - self._shown_at[0]
+        return (len(self._shown_at) - 1) / span if span > 0 else 0.0
+
+    def stats(self):
+        sizes = np.fromiter(self._bytes, dtype=np.float64)
+        ms = np.fromiter(self._encode_seconds, dtype=np.float64) * 1000.0
+        return {
+            "delivery_shown": self.shown,
+            "delivery_display_fps": round(self.display_fps(), 2),
+            "delivery_skipped": self.skipped,
+            "delivery_bytes_per_frame": int(sizes.mean()) if sizes.size else 0,
+            "delivery_encode_p50_ms": round(float(np.percentile(ms, 50)), 3) if ms.size else 0.0,
+        }
+
+
+# One delivery object per Streamlit session, kept in step with the sidebar
+def get_session_delivery(fmt, quality, max_width, max_fps):
+    delivery = st.session_state.get("frame_delivery")
+    if delivery is None:
+        delivery = FrameDelivery()
+        st.session_state.frame_delivery = delivery
+    delivery.fmt = fmt
+    delivery.quality = quality
+    delivery.max_width = None if max_width == "Full" else max_width
+    delivery.max_fps = max_fps
+    return delivery
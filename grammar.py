@@ -0,0 +1,170 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from composer import compose
+from correction_cache import CorrectionCache, cache_key
+
+# Point at a stub server in tests, e.g. OLLAMA_URL=http://127.0.0.1:8765
+OLLAMA_URL = os.environ.get("OLLAMA_URL", "http://localhost:11434")
+GRAMMAR_MODEL = os.environ.get("GRAMMAR_MODEL", "deepseek-llm")
+
+
+PROMPT_TEMPLATE = "Correct the grammar of this sentence and complete it: \"{text}\".\n{instructions}"
+
+
+def build_prompt(text, instructions):
+    return PROMPT_TEMPLATE.format(text=text, instructions=instructions)
+
+
+def prompt_version(instructions):
+    # Cached answers are only valid for the exact prompt that produced them
+    return hashlib.sha256((PROMPT_TEMPLATE + instructions).encode()).hexdigest()[:12]
+
+
+def clean_response(response):
+    return response.strip().strip('"\n ')
+
+
+class CorrectionJob:
+    """Handle for a correction running on the client's worker pool.
+
+    ``partial`` grows as tokens stream in; ``result()`` gives the final
+    sentence. ``tier`` records where it came from: "rules" (composer),
+    "cache", "llm", or "fallback" (composer output after the LLM failed
+    or timed out).
+    """
+
+    def __init__(self, text):
+        self.text = text
+        self.partial = ""
+        self.tier = None
+        self.future = None
+
+    def finish(self, corrected, tier):
+        self.partial = corrected
+        self.tier = tier
+        self.future = Future()
+        self.future.set_result(corrected)
+        return self
+
+    def done(self):
+        return self.future.done()
+
+    def result(self, timeout=None):
+        return self.future.result(timeout)
+
+
+# Streaming Ollama client with a pooled session and hard timeouts
+class GrammarClient:
+    """Talks to Ollama's /api/generate with ``stream: true``.
+
+    Sentences the rule-based composer fully covers never reach the LLM.
+    One ``requests.Session`` keeps connections alive across corrections.
+    ``connect_timeout`` and ``read_timeout`` (per chunk) go to requests;
+    ``total_timeout`` caps the whole answer. Any failure returns the
+    composer's best effort instead of raising. Successful answers are
+    memoized in ``cache`` (a CorrectionCache) and served from it without
+    a request.
+    """
+
+    def __init__(self, base_url=OLLAMA_URL, model=GRAMMAR_MODEL, connect_timeout=2.0,
+                 read_timeout=10.0, total_timeout=20.0, pool_size=4, cache=None):
+        self.url = base_url.rstrip("/") + "/api/generate"
+        self.model = model
+        self.timeout = (connect_timeout, read_timeout)
+        self.total_timeout = total_timeout
+        self.cache = cache
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=0)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self._executor = ThreadPoolExecutor(max_workers=pool_size, thread_name_prefix="grammar")
+
+    def stream(self, text, instructions, on_token=None):
+        """Blocking streamed correction; raises on HTTP errors and timeouts."""
+        deadline = time.monotonic() + self.total_timeout
+        payload = {"model": self.model, "prompt": build_prompt(text, instructions), "stream": True}
+        parts = []
+        with self.session.post(self.url, json=payload, stream=True, timeout=self.timeout) as response:
+            response.raise_for_status()
+            for line in response.iter_lines():
+                if time.monotonic() > deadline:
+                    raise requests.Timeout(f"No complete answer within {self.total_timeout}s")
+                if not line:
+                    continue
+                chunk = json.loads(line)
+                parts.append(chunk.get("response", ""))
+                if on_token is not None:
+                    on_token("".join(parts))
+                if chunk.get("done"):
+                    break
+        return clean_response("".join(parts))
+
+    def correct(self, text, instructions, on_token=None):
+        """Blocking correction through all tiers."""
+        return self.submit(text, instructions, on_token).result()
+
+    def submit(self, text, instructions, on_token=None):
+        job = CorrectionJob(text)
+        composed = compose(text.split())
+        if composed.complete:
+            return job.finish(composed.text, "rules")
+
+        key = cache_key(text, self.model, prompt_version(instructions)) if self.cache is not None else None
+        cached = self.cache.get(key) if key is not None else None
+        if cached is not None:
+            return job.finish(cached, "cache")
+
+        def on_partial(partial):
+            job.partial = partial
+            if on_token is not None:
+                on_token(partial)
+
+        def run():
+            try:
+                corrected = self.stream(text, instructions, on_partial)
+            except (requests.RequestException, ValueError):
+                corrected = ""
+            if not corrected:
+                job.tier = "fallback"
+                return composed.text or text
+            job.tier = "llm"
+            if key is not None:
+                self.cache.put(key, corrected)
+            return corrected
+
+        job.future = self._executor.submit(run)
+        return job
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+# Process-wide client so every session shares the connection pool
+def get_grammar_client():
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = GrammarClient(cache=CorrectionCache())
+        return _client
+
+
+def show_correction(job, placeholder, template, poll_seconds=0.1):
+    """Fill ``placeholder`` with the streaming answer, then the final sentence."""
+    shown = None
+    while not job.done():
+        if job.partial and job.partial != shown:
+            shown = job.partial
+            placeholder.info(template.format(clean_response(shown) + " …"))
+        time.sleep(poll_seconds)
+    corrected = job.result()
+    placeholder.info(template.format(corrected))
+    return corrected
@@ -0,0 +1,165 @@
+import os
+import threading
+import time
+
+import numpy as np
+
+from keypoints import layout_for_size
+
+# Output classes of best_model_withGPU3.h5, in model order
+ACTIONS = np.array(['hello', 'mandar', 'language', 'my', 'name', 'i', 'internet', 'computer', 'data-entry', 'one', 'please'])
+
+# Classifier weights under pages/ for each keypoints.FEATURE_LAYOUTS entry
+MODEL_FILES = {"full": "best_model_withGPU3.h5", "hands_pose": "best_model_hands_pose.h5"}
+DEFAULT_MODEL = os.path.join(os.path.dirname(os.path.abspath(__file__)), "pages", MODEL_FILES["full"])
+
+
+def available_layouts(model_dir):
+    """Feature layouts whose model file is present in ``model_dir``."""
+    return [layout for layout, filename in MODEL_FILES.items()
+            if os.path.exists(os.path.join(model_dir, filename))]
+
+
+# Direct-call wrapper around the Keras sign classifier
+class SignClassifier:
+    """Runs the LSTM through a traced ``tf.function`` instead of ``model.predict``.
+
+    ``predict`` builds a data adapter, a callback list and a fresh step
+    function context on every call, which costs far more than the LSTM
+    itself for a batch of one. Tracing ``model(x, training=False)`` once
+    gives the same graph ``predict`` runs internally, without the per-call
+    setup. The window shape, and with it the feature layout, is read from
+    the model's input unless given.
+    """
+
+    def __init__(self, model, sequence_length=None, feature_size=None, warm_up=True):
+        # TensorFlow is imported here, not at module level, so pages that only
+        # need ACTIONS stay cheap to import
+        import tensorflow as tf
+
+        _, model_length, model_features = model.input_shape
+        sequence_length = sequence_length or model_length
+        feature_size = feature_size or model_features
+        self.model = model
+        self.sequence_length = sequence_length
+        self.feature_size = feature_size
+        self.layout = layout_for_size(feature_size)
+        # A batch of N windows costs one call, not N
+        self.native_batching = True
+        self._call = tf.function(
+            lambda x: model(x, training=False),
+            input_signature=[tf.TensorSpec((None, sequence_length, feature_size), tf.float32)],
+        )
+        self.warmup_seconds = self.warm_up() if warm_up else None
+
+    @classmethod
+    def load(cls, model_path, **kwargs):
+        from keras.models import load_model
+
+        return cls(load_model(model_path), **kwargs)
+
+    def warm_up(self):
+        # First call traces and compiles the graph; keep that off the frame loop
+        start = time.perf_counter()
+        self._call(np.zeros((1, self.sequence_length, self.feature_size), dtype=np.float32))
+        self.warmup_seconds = time.perf_counter() - start
+        return self.warmup_seconds
+
+    def predict(self, batch):
+        """Return class probabilities for a (batch, frames, features) array."""
+        batch = np.asarray(batch, dtype=np.float32)
+        return self._call(batch).numpy()
+
+
+# Runtime for models exported by quantize.py
+class TFLiteClassifier:
+    """Runs a .tflite export of the classifier with SignClassifier's interface.
+
+    Uses the standalone ``tflite_runtime`` interpreter when installed and
+    TensorFlow's otherwise. Exports have a fixed batch of one (the LSTMs
+    only convert with static shapes), so larger batches are run row by
+    row. The interpreter is not thread-safe; calls are serialised.
+    """
+
+    def __init__(self, model_path, num_threads=1, warm_up=True):
+        try:
+            from tflite_runtime.interpreter import Interpreter
+        except ImportError:
+            import tensorflow as tf
+            Interpreter = tf.lite.Interpreter
+
+        self.model_path = model_path
+        self.interpreter = Interpreter(model_path=model_path, num_threads=num_threads)
+        self.interpreter.allocate_tensors()
+        model_input = self.interpreter.get_input_details()[0]
+        _, self.sequence_length, self.feature_size = (int(d) for d in model_input["shape"])
+        self.layout = layout_for_size(self.feature_size)
+        self.native_batching = False
+        self._input = model_input["index"]
+        self._output = self.interpreter.get_output_details()[0]["index"]
+        self._lock = threading.Lock()
+        self.warmup_seconds = self.warm_up() if warm_up else None
+
+    @classmethod
+    def load(cls, model_path, **kwargs):
+        return cls(model_path, **kwargs)
+
+    def warm_up(self):
+        start = time.perf_counter()
+        self.predict(np.zeros((1, self.sequence_length, self.feature_size), dtype=np.float32))
+        self.warmup_seconds = time.perf_counter() - start
+        return self.warmup_seconds
+
+    def predict(self, batch):
+        """Return class probabilities for a (batch, frames, features) array."""
+        batch = np.asarray(batch, dtype=np.float32)
+        outputs = []
+        with self._lock:
+            for window in batch:
+                self.interpreter.set_tensor(self._input, window[np.newaxis])
+                self.interpreter.invoke()
+                outputs.append(self.interpreter.get_tensor(self._output)[0])
+        return np.stack(outputs)
+
+
+# Runtime for ONNX exports of the classifier (e.g. converted with tf2onnx)
+class OnnxClassifier:
+    """Runs a .onnx export on ONNX Runtime's CPU provider with SignClassifier's interface.
+
+    Exports with a symbolic batch dimension take the whole batch in one
+    call; exports fixed to a batch of one are run row by row. Sessions
+    are safe to call from several threads.
+    """
+
+    def __init__(self, model_path, num_threads=1, warm_up=True):
+        import onnxruntime as ort
+
+        options = ort.SessionOptions()
+        options.intra_op_num_threads = num_threads
+        options.inter_op_num_threads = 1
+        self.model_path = model_path
+        self.session = ort.InferenceSession(model_path, options, providers=["CPUExecutionProvider"])
+        model_input = self.session.get_inputs()[0]
+        batch, self.sequence_length, self.feature_size = model_input.shape
+        self.layout = layout_for_size(self.feature_size)
+        self._input = model_input.name
+        self._fixed_batch = batch == 1
+        self.native_batching = not self._fixed_batch
+        self.warmup_seconds = self.warm_up() if warm_up else None
+
+    @classmethod
+    def load(cls, model_path, **kwargs):
+        return cls(model_path, **kwargs)
+
+    def warm_up(self):
+        start = time.perf_counter()
+        self.predict(np.zeros((1, self.sequence_length, self.feature_size), dtype=np.float32))
+        self.warmup_seconds = time.perf_counter() - start
+        return self.warmup_seconds
+
+    def predict(self, batch):
+        """Return class probabilities for a (batch, frames, features) array."""
+        batch = np.asarray(batch, dtype=np.float32)
+        if not self._fixed_batch:
+            return self.session.run(None, {self._input: batch})[0]
+        return np.concatenate([self.session.run(None, {self._input: window[np.newaxis]})[0] for window in batch])
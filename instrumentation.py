@@ -0,0 +1,151 @@
+import csv
+import os
+import time
+import uuid
+from collections import deque
+
+import numpy as np
+import streamlit as st
+
+# Directory for scrapeable metrics: one Prometheus textfile per session plus a
+# shared CSV log. Unset means nothing is written.
+METRICS_DIR = os.environ.get("SIGNLANG_METRICS_DIR")
+
+STAGES = ["capture", "landmark", "extract", "classify", "render"]
+
+
+# Hot-path timings and counters for one detection session
+class PipelineMetrics:
+    """Rolling per-stage timings, effective FPS and pipeline counters.
+
+    Effective FPS counts frames that left the pipeline's classify stage,
+    motion-gated frames that reused the previous landmarks included, so
+    it reflects processing throughput rather than the preview's display
+    cap. Callers check ``enabled`` before reading the clock, so a
+    disabled instance costs one attribute lookup per stage. ``publish`` is
+    throttled to ``interval`` seconds and updates the sidebar panel and/or
+    the files in ``export_dir``.
+    """
+
+    def __init__(self, session_id, enabled=False, export_dir=METRICS_DIR, window=300, interval=1.0):
+        self.session_id = session_id
+        self.export_dir = export_dir
+        self.enabled = enabled or bool(export_dir)
+        self.interval = interval
+        self._timings = {stage: deque(maxlen=window) for stage in STAGES}
+        self._processed = deque(maxlen=window)
+        self._last_publish = 0.0
+
+    def record(self, stage, seconds):
+        self._timings[stage].append(seconds)
+
+    def frame_processed(self):
+        self._processed.append(time.perf_counter())
+
+    def fps(self):
+        if len(self._processed) < 2:
+            return 0.0
+        span = self._processed[-1] - self._processed[0]
+        return (len(self._processed) - 1) / span if span > 0 else 0.0
+
+    def snapshot(self, pipeline_stats=None):
+        stages = {}
+        for stage, samples in self._timings.items():
+            if samples:
+                ms = np.fromiter(samples, dtype=np.float64) * 1000.0
+                stages[stage] = {
+                    "p50_ms": float(np.percentile(ms, 50)),
+                    "p95_ms": float(np.percentile(ms, 95)),
+                }
+        stats = dict(pipeline_stats or {})
+        dropped = sum(v for k, v in stats.items() if k.endswith("_dropped"))
+        return {"fps": self.fps(), "dropped_frames": dropped, "stages": stages, "counters": stats}
+
+    def publish(self, pipeline_stats=None, panel=None):
+        now = time.perf_counter()
+        if now - self._last_publish < self.interval:
+            return
+        self._last_publish = now
+        snapshot = self.snapshot(pipeline_stats)
+        if panel is not None:
+            render_panel(panel, snapshot)
+        if self.export_dir:
+            self.export(snapshot)
+
+    def export(self, snapshot):
+        os.makedirs(self.export_dir, exist_ok=True)
+        labels = f'session="{self.session_id}"'
+        lines = [
+            "# TYPE signlang_fps gauge",
+            f"signlang_fps{{{labels}}} {snapshot['fps']:.3f}",
+            "# TYPE signlang_dropped_frames_total counter",
+            f"signlang_dropped_frames_total{{{labels}}} {snapshot['dropped_frames']}",
+            "# TYPE signlang_stage_latency_ms gauge",
+        ]
+        for stage, stats in snapshot["stages"].items():
+            for quantile, key in (("0.5", "p50_ms"), ("0.95", "p95_ms")):
+                lines.append(f'signlang_stage_latency_ms{{{labels},stage="{stage}",quantile="{quantile}"}} '
+                             f"{stats[key]:.3f}")
+        for name, value in snapshot["counters"].items():
+            lines.append(f"signlang_pipeline_{name}{{{labels}}} {value}")
+
+        # Write then rename so a scraper never sees a half-written file
+        prom_path = os.path.join(self.export_dir, f"signlang_{self.session_id}.prom")
+        with open(prom_path + ".tmp", "w") as f:
+            f.write("\n".join(lines) + "\n")
+        os.replace(prom_path + ".tmp", prom_path)
+
+        csv_path = os.path.join(self.export_dir, "signlang_metrics.csv")
+        row = {"time": time.strftime("%Y-%m-%dT%H:%M:%S"), "session": self.session_id,
+               "fps": round(snapshot["fps"], 3), "dropped_frames": snapshot["dropped_frames"]}
+        for stage in STAGES:
+            row[f"{stage}_p50_ms"] = round(snapshot["stages"].get(stage, {}).get("p50_ms", 0.0), 3)
+        new_file = not os.path.exists(csv_path)
+        with open(csv_path, "a", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=list(row))
+            if new_file:
+                writer.writeheader()
+            writer.writerow(row)
+
+
+def render_panel(panel, snapshot):
+    lines = [
+        f"**FPS:** {snapshot['fps']:.1f} &nbsp; **Dropped:** {snapshot['dropped_frames']} "
+        f"&nbsp; **Inferences:** {snapshot['counters'].get('inferences', 0)}",
+    ]
+    counters = snapshot["counters"]
+    if "batcher_batches" in counters:
+        lines += ["", f"**Mean batch:** {counters['batcher_mean_batch']} &nbsp; "
+                      f"**Batch wait p95:** {counters['batcher_wait_p95_ms']:.1f} ms"]
+    if "delivery_shown" in counters:
+        lines += ["", f"**Frame size:** {counters['delivery_bytes_per_frame'] / 1024:.1f} KiB &nbsp; "
+                      f"**Encode p50:** {counters['delivery_encode_p50_ms']:.1f} ms &nbsp; "
+                      f"**Display FPS:** {counters['delivery_display_fps']:.1f} &nbsp; "
+                      f"**Display-capped:** {counters['delivery_skipped']}"]
+    if "chat_writer_batches" in counters:
+        flush = counters.get("chat_writer_last_flush_ms")
+        lines += ["", f"**Chat writes queued:** {counters['chat_writer_queued'] + counters['chat_writer_pending']} "
+                      f"&nbsp; **Last flush:** {'n/a' if flush is None else f'{flush:.1f} ms'} "
+                      f"&nbsp; **Write failures:** {counters['chat_writer_failures']} "
+                      f"&nbsp; **Dropped messages:** {counters['chat_writer_dead_lettered']}"]
+    if "gate_frames" in counters:
+        lines += ["", f"**Idle skip ratio:** {counters['gate_recent_skip_ratio']:.0%} recent, "
+                      f"{counters['gate_skip_ratio']:.0%} overall{' (idle)' if counters['gate_idle'] else ''}"]
+    lines += [
+        "",
+        "| stage | p50 ms | p95 ms |",
+        "|---|---|---|",
+    ]
+    for stage, stats in snapshot["stages"].items():
+        lines.append(f"| {stage} | {stats['p50_ms']:.1f} | {stats['p95_ms']:.1f} |")
+    panel.markdown("\n".join(lines))
+
+
+# One metrics object per Streamlit session
+def get_session_metrics(show_panel):
+    metrics = st.session_state.get("metrics")
+    if metrics is None:
+        metrics = PipelineMetrics(uuid.uuid4().hex[:8])
+        st.session_state.metrics = metrics
+    metrics.enabled = show_panel or bool(metrics.export_dir)
+    return metrics
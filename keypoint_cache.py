@@ -0,0 +1,117 @@
+import hashlib
+import json
+import os
+
+import numpy as np
+
+from keypoints import KEYPOINT_SIZE, to_hands_pose
+
+# Bump when extract_keypoints' layout or semantics change
+EXTRACTOR_VERSION = 1
+DEFAULT_CACHE_DIR = ".keypoint_cache"
+
+
+def hash_file(path, chunk_size=1 << 20):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+# On-disk store of per-frame keypoint vectors
+class KeypointCache:
+    """Caches extract_keypoints output per video as a raw float32 memmap.
+
+    Entries are keyed by the SHA-256 of the video bytes plus the extractor
+    settings, so re-encoding a video or changing Holistic options produces
+    a new entry. Each entry is ``<key>.f32`` (frames x KEYPOINT_SIZE,
+    C order) and ``<key>.json`` with its shape and metadata; the JSON is
+    written last, so an entry without one is incomplete and ignored.
+    """
+
+    def __init__(self, root=DEFAULT_CACHE_DIR):
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+
+    def key(self, video_path, settings):
+        settings = dict(settings, extractor_version=EXTRACTOR_VERSION, keypoint_size=KEYPOINT_SIZE)
+        digest = hashlib.sha256(hash_file(video_path).encode())
+        digest.update(json.dumps(settings, sort_keys=True).encode())
+        return digest.hexdigest()
+
+    def keys(self):
+        """Keys of all complete entries, in a stable order."""
+        return sorted(name[:-len(".json")] for name in os.listdir(self.root) if name.endswith(".json"))
+
+    def _paths(self, key):
+        base = os.path.join(self.root, key)
+        return base + ".f32", base + ".json"
+
+    def load(self, key):
+        """Return (keypoints, meta) with keypoints memory-mapped read-only, or None."""
+        data_path, meta_path = self._paths(key)
+        if not os.path.exists(meta_path):
+            return None
+        with open(meta_path) as f:
+            meta = json.load(f)
+        shape = (meta["frames"], meta["keypoint_size"])
+        if meta["frames"] == 0:
+            return np.empty(shape, dtype=np.float32), meta
+        return np.memmap(data_path, dtype=np.float32, mode="r", shape=shape), meta
+
+    def writer(self, key, **meta):
+        return KeypointCacheWriter(*self._paths(key), meta)
+
+
+class KeypointCacheWriter:
+    """Streams keypoint rows to a cache entry; commits on a clean exit."""
+
+    def __init__(self, data_path, meta_path, meta):
+        self.data_path = data_path
+        self.meta_path = meta_path
+        self.meta = meta
+        self.frames = 0
+        self._file = None
+
+    def __enter__(self):
+        self._file = open(self.data_path + ".tmp", "wb")
+        return self
+
+    def append(self, keypoints):
+        keypoints.tofile(self._file)
+        self.frames += 1
+
+    def __exit__(self, exc_type, exc, tb):
+        self._file.close()
+        if exc_type is not None:
+            os.remove(self.data_path + ".tmp")
+            return False
+        meta = dict(self.meta, frames=self.frames, keypoint_size=KEYPOINT_SIZE, dtype="float32")
+        with open(self.meta_path + ".tmp", "w") as f:
+            json.dump(meta, f)
+        os.replace(self.data_path + ".tmp", self.data_path)
+        os.replace(self.meta_path + ".tmp", self.meta_path)
+        return False
+
+
+def cached_windows(cache_dir, sequence_length, layout, stride, limit=None):
+    """Stack windows cut from the cached keypoints, stopping after ``limit``.
+
+    Cached keypoints are memory-mapped, so only the frames of the windows
+    that are kept are read from disk.
+    """
+    cache = KeypointCache(cache_dir)
+    windows = []
+    for key in cache.keys():
+        keypoints, _ = cache.load(key)
+        for start in range(0, len(keypoints) - sequence_length + 1, stride):
+            if limit is not None and len(windows) >= limit:
+                break
+            window = np.array(keypoints[start:start + sequence_length], dtype=np.float32)
+            windows.append(to_hands_pose(window) if layout == "hands_pose" else window)
+        if limit is not None and len(windows) >= limit:
+            break
+    if not windows:
+        return np.empty((0, sequence_length, 0), dtype=np.float32)
+    return np.stack(windows)
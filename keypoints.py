@@ -0,0 +1,100 @@
+import numpy as np
+
+# Landmark counts reported by MediaPipe Holistic
+POSE_LANDMARKS = 33
+FACE_LANDMARKS = 468
+HAND_LANDMARKS = 21
+
+# Fixed offsets into the flat keypoint vector: pose(x,y,z,vis) | face | left hand | right hand
+POSE_OFFSET = 0
+FACE_OFFSET = POSE_OFFSET + POSE_LANDMARKS * 4
+LH_OFFSET = FACE_OFFSET + FACE_LANDMARKS * 3
+RH_OFFSET = LH_OFFSET + HAND_LANDMARKS * 3
+KEYPOINT_SIZE = RH_OFFSET + HAND_LANDMARKS * 3  # 1662
+
+# Reduced layout without the face mesh: pose(x,y,z,vis) | left hand | right hand
+HP_LH_OFFSET = POSE_OFFSET + POSE_LANDMARKS * 4
+HP_RH_OFFSET = HP_LH_OFFSET + HAND_LANDMARKS * 3
+HANDS_POSE_SIZE = HP_RH_OFFSET + HAND_LANDMARKS * 3  # 258
+
+# Feature layout name -> vector length; a classifier's input width picks its layout
+FEATURE_LAYOUTS = {"full": KEYPOINT_SIZE, "hands_pose": HANDS_POSE_SIZE}
+
+
+def _write_xyz(out, buf, offset, landmarks, count):
+    if landmarks is None:
+        out[offset:offset + count * 3] = 0.0
+        return
+    points = landmarks.landmark
+    if len(points) > count:
+        # refine_face_landmarks appends 10 iris points after the 468 mesh points
+        points = points[:count]
+    j = offset
+    for lm in points:
+        buf[j] = lm.x
+        buf[j + 1] = lm.y
+        buf[j + 2] = lm.z
+        j += 3
+
+
+def _write_xyzv(out, buf, offset, landmarks, count):
+    if landmarks is None:
+        out[offset:offset + count * 4] = 0.0
+        return
+    j = offset
+    for lm in landmarks.landmark:
+        buf[j] = lm.x
+        buf[j + 1] = lm.y
+        buf[j + 2] = lm.z
+        buf[j + 3] = lm.visibility
+        j += 4
+
+
+# Keypoint extractor
+def extract_keypoints(results, out=None):
+    """Write Holistic landmarks into a flat float32 vector of KEYPOINT_SIZE.
+
+    ``out`` may be any contiguous float32 array of that length (for example
+    one row of the sequence window); it is filled in place and returned.
+    The layout matches the original list-based extractor, missing parts are
+    zero-filled.
+    """
+    if out is None:
+        out = np.empty(KEYPOINT_SIZE, dtype=np.float32)
+    buf = memoryview(out)
+    _write_xyzv(out, buf, POSE_OFFSET, results.pose_landmarks, POSE_LANDMARKS)
+    _write_xyz(out, buf, FACE_OFFSET, results.face_landmarks, FACE_LANDMARKS)
+    _write_xyz(out, buf, LH_OFFSET, results.left_hand_landmarks, HAND_LANDMARKS)
+    _write_xyz(out, buf, RH_OFFSET, results.right_hand_landmarks, HAND_LANDMARKS)
+    return out
+
+
+def extract_hands_pose(results, out=None):
+    """Like extract_keypoints, for the HANDS_POSE_SIZE layout (no face mesh)."""
+    if out is None:
+        out = np.empty(HANDS_POSE_SIZE, dtype=np.float32)
+    buf = memoryview(out)
+    _write_xyzv(out, buf, POSE_OFFSET, results.pose_landmarks, POSE_LANDMARKS)
+    _write_xyz(out, buf, HP_LH_OFFSET, results.left_hand_landmarks, HAND_LANDMARKS)
+    _write_xyz(out, buf, HP_RH_OFFSET, results.right_hand_landmarks, HAND_LANDMARKS)
+    return out
+
+
+def to_hands_pose(keypoints):
+    """Drop the face mesh from full-layout vectors: (..., 1662) -> (..., 258).
+
+    Lets a hands+pose classifier be trained on, or fed from, keypoints
+    extracted in the full layout (such as the keypoint cache).
+    """
+    return np.concatenate([keypoints[..., :FACE_OFFSET], keypoints[..., LH_OFFSET:]], axis=-1)
+
+
+def layout_for_size(size):
+    for layout, layout_size in FEATURE_LAYOUTS.items():
+        if layout_size == size:
+            return layout
+    raise ValueError(f"No feature layout has {size} features")
+
+
+def get_extractor(layout):
+    return {"full": extract_keypoints, "hands_pose": extract_hands_pose}[layout]
@@ -0,0 +1,110 @@
+import streamlit as st
+
+# Holistic options per performance profile, from most accurate to fastest.
+# "balanced" is what Holistic does with its defaults.
+PROFILES = {
+    "accurate": {"model_complexity": 2, "refine_face_landmarks": True, "smooth_landmarks": True},
+    "balanced": {"model_complexity": 1, "refine_face_landmarks": False, "smooth_landmarks": True},
+    "fast": {"model_complexity": 0, "refine_face_landmarks": False, "smooth_landmarks": False},
+}
+DEFAULT_PROFILE = "balanced"
+
+
+# MediaPipe is only imported once landmarking is actually used
+def _solutions():
+    import mediapipe as mp
+
+    return mp.solutions.holistic, mp.solutions.drawing_utils
+
+
+# Long-lived Holistic wrapper
+class LandmarkEngine:
+    """Owns one MediaPipe Holistic graph for the lifetime of a session.
+
+    The graph is built once and fed every frame in video mode, so the
+    tracker can reuse the previous frame's landmarks instead of running
+    full detection again (this is what makes ``min_tracking_confidence``
+    do anything). ``profile`` picks one of PROFILES. Frames wider than
+    ``inference_width`` are shrunk once before Holistic; landmarks come
+    back normalised to [0, 1], so they still line up with the full-size
+    frame they are drawn on.
+    """
+
+    def __init__(self, min_detection_confidence=0.5, min_tracking_confidence=0.5, profile=DEFAULT_PROFILE,
+                 inference_width=None):
+        self.min_detection_confidence = min_detection_confidence
+        self.min_tracking_confidence = min_tracking_confidence
+        self.profile = profile
+        self.inference_width = inference_width
+        mp_holistic, _ = _solutions()
+        self.holistic = mp_holistic.Holistic(
+            static_image_mode=False,
+            min_detection_confidence=min_detection_confidence,
+            min_tracking_confidence=min_tracking_confidence,
+            **PROFILES[profile],
+        )
+
+    def settings(self):
+        # Everything that affects the landmarks produced; used for cache keys
+        return {
+            "min_detection_confidence": self.min_detection_confidence,
+            "min_tracking_confidence": self.min_tracking_confidence,
+            "inference_width": self.inference_width,
+            **PROFILES[self.profile],
+        }
+
+    def process(self, frame):
+        import cv2
+
+        height, width = frame.shape[:2]
+        if self.inference_width and width > self.inference_width:
+            size = (self.inference_width, round(height * self.inference_width / width))
+            frame = cv2.resize(frame, size, interpolation=cv2.INTER_AREA)
+        # MediaPipe wants RGB; marking it read-only lets it skip a copy
+        image = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+        image.flags.writeable = False
+        return self.holistic.process(image)
+
+    def close(self):
+        if self.holistic is not None:
+            self.holistic.close()
+            self.holistic = None
+
+
+# Overlay landmarks on a BGR frame
+def draw_landmarks(image, results):
+    mp_holistic, mp_drawing = _solutions()
+    mp_drawing.draw_landmarks(image, results.face_landmarks, mp_holistic.FACEMESH_CONTOURS)
+    mp_drawing.draw_landmarks(image, results.left_hand_landmarks, mp_holistic.HAND_CONNECTIONS)
+    mp_drawing.draw_landmarks(image, results.right_hand_landmarks, mp_holistic.HAND_CONNECTIONS)
+
+
+# Draw prediction probs
+def display_probabilities(image, res, actions):
+    import cv2
+
+    # No scores before the first inference
+    if res is None:
+        return
+    for i, (action, prob) in enumerate(zip(actions, res)):
+        cv2.putText(image, f"{action}: {prob:.2f}", (10, 30+i*30),
+                   cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0,255,0), 2)
+
+
+# One engine per Streamlit session, kept across reruns
+def get_session_engine(min_detection_confidence=0.5, min_tracking_confidence=0.5, profile=DEFAULT_PROFILE,
+                       inference_width=None):
+    engine = st.session_state.get("landmark_engine")
+    if engine is not None and engine.profile != profile:
+        engine.close()
+    if engine is None or engine.holistic is None:
+        engine = LandmarkEngine(min_detection_confidence, min_tracking_confidence, profile)
+        st.session_state.landmark_engine = engine
+    engine.inference_width = inference_width
+    return engine
+
+
+def reset_session_engine():
+    engine = st.session_state.pop("landmark_engine", None)
+    if engine is not None:
+        engine.close()
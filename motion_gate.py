@@ -0,0 +1,80 @@
+from collections import deque
+
+import numpy as np
+
+
+# Cheap pre-stage that decides whether a frame is worth landmarking
+class MotionGate:
+    """Detects idle periods by differencing small greyscale thumbnails.
+
+    Each frame is shrunk to ``thumb_width`` pixels wide and compared with
+    the previous thumbnail. The motion score is the mean absolute
+    grey-level difference (0-255). After ``idle_frames`` consecutive frames
+    below ``threshold`` the gate goes idle and lets only every
+    ``idle_interval``-th frame through (0 skips them all). The first frame
+    above the threshold reopens it. ``check`` costs a resize and a diff on
+    a few thousand pixels, far less than Holistic on the full frame.
+    """
+
+    def __init__(self, threshold=4.0, idle_frames=15, idle_interval=10, thumb_width=64, window=300):
+        self.threshold = threshold
+        self.idle_frames = idle_frames
+        self.idle_interval = idle_interval
+        self.thumb_width = thumb_width
+        self.frames = 0
+        self.skipped = 0
+        self.idle = False
+        self.score = 0.0
+        self._still = 0
+        self._since_pass = 0
+        self._previous = None
+        self._recent = deque(maxlen=window)
+
+    def _thumbnail(self, frame):
+        import cv2
+
+        height, width = frame.shape[:2]
+        size = (self.thumb_width, max(1, round(height * self.thumb_width / width)))
+        small = cv2.resize(frame, size, interpolation=cv2.INTER_AREA)
+        return cv2.cvtColor(small, cv2.COLOR_BGR2GRAY)
+
+    def check(self, frame):
+        """Return True if ``frame`` should be landmarked and classified."""
+        import cv2
+
+        thumb = self._thumbnail(frame)
+        if self._previous is not None and self._previous.shape == thumb.shape:
+            self.score = float(cv2.absdiff(thumb, self._previous).mean())
+        else:
+            self.score = float("inf")
+        self._previous = thumb
+        self.frames += 1
+
+        if self.score >= self.threshold:
+            self._still = 0
+            self.idle = False
+        else:
+            self._still += 1
+            if self._still >= self.idle_frames:
+                self.idle = True
+
+        passed = True
+        if self.idle:
+            self._since_pass += 1
+            passed = bool(self.idle_interval) and self._since_pass >= self.idle_interval
+        if passed:
+            self._since_pass = 0
+        else:
+            self.skipped += 1
+        self._recent.append(passed)
+        return passed
+
+    def stats(self):
+        recent = np.fromiter(self._recent, dtype=bool)
+        return {
+            "gate_frames": self.frames,
+            "gate_skipped": self.skipped,
+            "gate_idle": int(self.idle),
+            "gate_skip_ratio": round(self.skipped / self.frames, 3) if self.frames else 0.0,
+            "gate_recent_skip_ratio": round(1.0 - float(recent.mean()), 3) if recent.size else 0.0,
+        }
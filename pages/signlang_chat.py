@@ -1,15 +1,26 @@
 import sys
 import os
 import time
-import cv2
-import numpy as np
 import streamlit as st
-import mediapipe as mp
-from keras.models import load_model
-from datetime import datetime
-import pyttsx3
-import requests
+from firebase_admin import firestore
 from firebase_config import db
+from landmark_engine import PROFILES, DEFAULT_PROFILE, get_session_engine, reset_session_engine, display_probabilities
+from sequence_buffer import SequenceWindow
+from inference import ACTIONS, MODEL_FILES, available_layouts
+from backends import load_inference_config, select_backend, warm_up_classifier
+from batching import BatchingClassifier
+from pipeline import SignPipeline
+from motion_gate import MotionGate
+from capture import INFERENCE_WIDTHS, RESOLUTIONS, apply_sidebar, choices, load_capture_config, open_capture
+from smoothing import SMOOTHING_METHODS, get_session_smoother
+from sentence import append_word
+from instrumentation import get_session_metrics
+from frame_delivery import DELIVERY_FORMATS, PREVIEW_WIDTHS, get_session_delivery
+from grammar import get_grammar_client, show_correction
+from speech import get_speech_worker
+from resources import describe_resource, get_resource, resource_stats
+from chat_sync import get_session_chat_sync
+from chat_writer import get_chat_writer
 
 # Add root directory to sys.path
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
@@ -43,102 +54,115 @@ st.title("🧏 Sign Language Detection + Interview Chat")
 st.success(f"Welcome, {st.session_state['username']}!")
 st.markdown("---")
 
-# Initialize MediaPipe
-mp_holistic = mp.solutions.holistic
-mp_drawing = mp.solutions.drawing_utils 
-
 # Load model
+# Only feature layouts with a model file on disk are offered in the sidebar
+MODEL_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), r"C:\Users\conta\Desktop\Web\pages"))
+LAYOUTS = available_layouts(MODEL_DIR) or ["full"]
 try:
-    model_path = os.path.join(os.path.dirname(__file__), r"C:\Users\conta\Desktop\Web\pages\best_model_withGPU3.h5")
-    model_path = os.path.abspath(model_path)
+    # Feature layout is chosen in the sidebar; read before the widget on reruns
+    if st.session_state.get("feature_layout") not in LAYOUTS:
+        st.session_state.feature_layout = LAYOUTS[0]
+    model_path = os.path.join(MODEL_DIR, MODEL_FILES[st.session_state.feature_layout])
     if not os.path.exists(model_path):
         raise FileNotFoundError(f"Model file not found at: {model_path}")
-    model = load_model(model_path)
-    actions = np.array(['hello', 'mandar', 'language', 'my', 'name', 'i', 'internet', 'computer', 'data-entry', 'one', 'please'])
+    # Keras, TFLite or ONNX Runtime: fixed in app_config.json or, on
+    # "auto", the fastest backend that matches the Keras model's output
+    classifier = get_resource(f"sign-classifier:{model_path}",
+                              lambda: select_backend(model_path, **load_inference_config(), warm_up=False),
+                              warmup=warm_up_classifier)
+    # Every session's pipeline submits through one batcher so concurrent
+    # interviews share classifier calls. Backends that run a batch row by
+    # row gain nothing from it and are called directly.
+    batcher = classifier
+    if classifier.native_batching:
+        batcher = get_resource(f"sign-batcher:{model_path}", lambda: BatchingClassifier(classifier))
+    actions = ACTIONS
 except Exception as e:
     st.error(f"Error loading model: {str(e)}")
+    # Go back to the full-layout model on the next rerun
+    st.session_state.feature_layout = "full"
     st.stop()
 
 # Text-to-speech
 def speak_text(text):
-    try:
-        engine = pyttsx3.init()
-        engine.setProperty('rate', 150)
-        engine.setProperty('volume', 1.0)
-        engine.say(text)
-        engine.runAndWait()
-    except Exception as e:
-        st.error(f"Speech failed: {e}")
+    # Queued on the shared speech worker; detection carries on while it speaks
+    get_speech_worker().say(text)
 
 # Grammar correction using DeepSeek
+GRAMMAR_INSTRUCTIONS = "Only reply with the corrected sentence. No other explanation. Dont even say corrected sentence just give the sentence as the output that is it."
+
 def correct_grammar_with_deepseek(text):
-    prompt = (
-        f"Correct the grammar of this sentence and complete it: \"{text}\".\n"
-        "Only reply with the corrected sentence. No other explanation. Dont even say corrected sentence just give the sentence as the output that is it."
-    )
-
-    try:
-        response = requests.post(
-            "http://localhost:11434/api/generate",
-            json={
-                "model": "deepseek-llm",
-                "prompt": prompt,
-                "stream": False
-            }
-        )
-        if response.status_code == 200:
-            return response.json()["response"].strip().strip('"\n ')
-        else:
-            return text
-    except:
-        return text
-
-# Keypoint extractor
-def extract_keypoints(results):
-    pose = np.array([[res.x, res.y, res.z, res.visibility] for res in results.pose_landmarks.landmark]).flatten() if results.pose_landmarks else np.zeros(33*4)
-    face = np.array([[res.x, res.y, res.z] for res in results.face_landmarks.landmark]).flatten() if results.face_landmarks else np.zeros(468*3)
-    lh = np.array([[res.x, res.y, res.z] for res in results.left_hand_landmarks.landmark]).flatten() if results.left_hand_landmarks else np.zeros(21*3)
-    rh = np.array([[res.x, res.y, res.z] for res in results.right_hand_landmarks.landmark]).flatten() if results.right_hand_landmarks else np.zeros(21*3)
-    return np.concatenate([pose, face, lh, rh])
+    # Streams on the shared client's pool; falls back to the raw text on timeout
+    return get_grammar_client().submit(text, GRAMMAR_INSTRUCTIONS)
 
 # Update sentence and track number of new words
 def update_sentence(new_action):
-    if len(st.session_state.sentence) == 0 or new_action != st.session_state.sentence[-1]:
-        st.session_state.sentence.append(new_action)
+    st.session_state.sentence, added = append_word(st.session_state.sentence, new_action, max_words=15)
+    if added:
         st.session_state.words_collected += 1
-    if len(st.session_state.sentence) > 15:
-        st.session_state.sentence = st.session_state.sentence[-15:]
-
-# Display probabilities
-def display_probabilities(image, res, actions):
-    for i, (action, prob) in enumerate(zip(actions, res)):
-        cv2.putText(image, f"{action}: {prob:.2f}", (10, 30+i*30), 
-                   cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0,255,0), 2)
 
 # Session state init
-for key in ['sequence', 'sentence', 'webcam_active', 'final_sentence', 'words_collected']:
+for key in ['sentence', 'webcam_active', 'final_sentence', 'words_collected']:
     if key not in st.session_state:
-        st.session_state[key] = [] if key in ['sequence', 'sentence'] else False if key == 'webcam_active' else "" if key == 'final_sentence' else 0
+        st.session_state[key] = [] if key == 'sentence' else False if key == 'webcam_active' else "" if key == 'final_sentence' else 0
+if 'sequence' not in st.session_state or st.session_state.sequence.size != classifier.feature_size:
+    st.session_state.sequence = SequenceWindow(classifier.sequence_length, classifier.feature_size)
+
+# Capture settings from app_config.json; the sidebar can override them
+CAPTURE_CONFIG = load_capture_config()
 
 # Sidebar controls
 with st.sidebar:
     st.header("Settings")
     threshold = st.slider("Detection Threshold", 0.1, 1.0, 0.7, key="threshold")
+    st.slider("Inference Stride", 1, 10, 1, key="stride", help="Run the classifier on every N-th frame")
+    st.selectbox("Smoothing", SMOOTHING_METHODS, key="smoothing")
+    st.slider("Smoothing Window", 1, 15, 5, key="smoothing_window", help="EMA span or number of votes")
+    st.slider("Hysteresis Frames", 1, 10, 1, key="hysteresis", help="Inferences a word must stay on top before it is added")
+    st.selectbox("Performance Profile", list(PROFILES), index=list(PROFILES).index(DEFAULT_PROFILE), key="profile",
+                 help="Holistic model complexity, face refinement and landmark smoothing")
+    st.selectbox("Feature Layout", LAYOUTS, key="feature_layout",
+                 help="hands_pose drops the face mesh and needs its own model file")
+    resolutions, resolution_index = choices(RESOLUTIONS, f"{CAPTURE_CONFIG['width']}x{CAPTURE_CONFIG['height']}")
+    st.selectbox("Capture Resolution", resolutions, index=resolution_index, key="capture_resolution")
+    st.slider("Capture FPS", 5, 60, CAPTURE_CONFIG["fps"], key="capture_fps")
+    widths, width_index = choices(INFERENCE_WIDTHS, CAPTURE_CONFIG["inference_width"] or "Full")
+    st.select_slider("Inference Width", widths, value=widths[width_index], key="inference_width",
+                     help="Frames are shrunk to this width before landmark detection")
+    st.checkbox("Skip Idle Frames", key="motion_gate", help="Pause landmarking and inference while nothing moves")
+    if st.session_state.motion_gate:
+        st.slider("Motion Threshold", 0.5, 20.0, 4.0, 0.5, key="motion_threshold",
+                  help="Mean grey-level change (0-255) between thumbnails that counts as motion")
+        st.slider("Idle After Frames", 5, 60, 15, key="idle_frames")
+        st.slider("Idle Check Interval", 0, 30, 10, key="idle_interval",
+                  help="While idle, still process every N-th frame (0 = none)")
+    st.selectbox("Preview Format", DELIVERY_FORMATS, key="preview_format")
+    st.slider("Preview Quality", 30, 95, 75, key="preview_quality", help="JPEG/WebP quality")
+    st.select_slider("Preview Width", PREVIEW_WIDTHS, value=640, key="preview_width")
+    st.slider("Display FPS Cap", 1, 30, 15, key="display_fps", help="Frames shown per second; detection runs at its own rate")
+    st.checkbox("Show performance metrics", key="show_metrics")
+    METRICS_PANEL = st.empty()
+    if st.session_state.show_metrics:
+        st.caption(f"Classifier backend: {classifier.backend} "
+                   f"({'batched' if batcher is not classifier else 'unbatched'})")
+        for info in resource_stats():
+            st.caption(describe_resource(info))
 
     st.markdown("---")
     st.subheader("Chat Messages")
-    messages = db.collection("chat").order_by("timestamp").stream()
-    for msg in messages:
-        data = msg.to_dict()
-        if data["sender"] == "interviewer":
-            st.markdown(f"👤 *{data['message']}*")
+    chat = get_session_chat_sync(db.collection("chat"))
+    chat.sync()
+    for data in chat.recent(sender="interviewer"):
+        st.markdown(f"👤 *{data['message']}*")
 
     st.markdown("---")
     if st.button("🔄 Reset Session"):
-        st.session_state.sequence = []
+        st.session_state.sequence.clear()
         st.session_state.sentence = []
         st.session_state.final_sentence = ""
+        st.session_state.pop('smoother_settings', None)
         st.session_state.words_collected = 0
+        reset_session_engine()
         st.rerun()
     if st.button("← Back to Home"):
         st.session_state.webcam_active = False
@@ -176,46 +200,71 @@ with col2:
 # Webcam logic
 cap = None
 if run:
-    cap = cv2.VideoCapture(0)
+    capture_config = apply_sidebar(CAPTURE_CONFIG, st.session_state.capture_resolution,
+                                   st.session_state.capture_fps, st.session_state.inference_width)
+    cap = open_capture(capture_config)
     st.session_state.webcam_active = True
 
 frame_count = 0
 max_frames = 500
+pipeline = None
+if run:
+    engine = get_session_engine(min_detection_confidence=0.5, min_tracking_confidence=0.5,
+                                profile=st.session_state.profile,
+                                inference_width=capture_config["inference_width"])
+    smoother = get_session_smoother(st.session_state.smoothing, st.session_state.smoothing_window,
+                                     st.session_state.hysteresis)
+    metrics = get_session_metrics(st.session_state.show_metrics)
+    delivery = get_session_delivery(st.session_state.preview_format, st.session_state.preview_quality,
+                                    st.session_state.preview_width, st.session_state.display_fps)
+    gate = None
+    if st.session_state.motion_gate:
+        gate = MotionGate(st.session_state.motion_threshold, st.session_state.idle_frames,
+                          st.session_state.idle_interval)
+    # The smoother runs on the classify worker so it sees every inference,
+    # including those whose frames are dropped before they are shown
+    pipeline = SignPipeline(cap, engine, batcher, st.session_state.sequence,
+                            stride=st.session_state.stride, metrics=metrics, gate=gate,
+                            smoother=smoother, threshold=st.session_state.threshold).start()
 
-while run and st.session_state.webcam_active and frame_count < max_frames:
-    ret, frame = cap.read()
-    frame_count += 1
-    if not ret:
-        st.error("Webcam error")
-        break
-
-    with mp_holistic.Holistic(min_detection_confidence=0.5, min_tracking_confidence=0.5) as holistic:
-        try:
-            image = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            results = holistic.process(image)
-            image = cv2.cvtColor(image, cv2.COLOR_RGB2BGR)
-
-            mp_drawing.draw_landmarks(image, results.face_landmarks, mp_holistic.FACE_CONNECTIONS)
-            mp_drawing.draw_landmarks(image, results.left_hand_landmarks, mp_holistic.HAND_CONNECTIONS)
-            mp_drawing.draw_landmarks(image, results.right_hand_landmarks, mp_holistic.HAND_CONNECTIONS)
-
-            keypoints = extract_keypoints(results)
-            st.session_state.sequence.append(keypoints)
-            st.session_state.sequence = st.session_state.sequence[-30:]
-
-            if len(st.session_state.sequence) == 30:
-                res = model.predict(np.expand_dims(st.session_state.sequence, axis=0))[0]
-                if res[np.argmax(res)] > st.session_state.threshold:
-                    update_sentence(actions[np.argmax(res)])
-
-                DETECTION_WINDOW.success(f"Detected: {' '.join(st.session_state.sentence)}")
-                display_probabilities(image, res, actions)
-
-            FRAME_WINDOW.image(image, channels="BGR")
-
-        except Exception as e:
-            st.error(f"Processing error: {str(e)}")
-            break
+try:
+    while run and st.session_state.webcam_active and frame_count < max_frames:
+        result = pipeline.get(timeout=1.0)
+        if result is None:
+            # A stage that died stops the loop even if it left no error behind
+            if pipeline.error or not pipeline.alive():
+                st.error(pipeline.error or "Detection stopped unexpectedly")
+                break
+            continue
+        frame_count += 1
+        image, res = result.image, result.probabilities
+
+        committed = pipeline.committed()
+        for index in committed:
+            update_sentence(actions[index])
+        if committed or res is not None:
+            DETECTION_WINDOW.success(f"Detected: {' '.join(st.session_state.sentence)}")
+
+        # Frames beyond the display FPS cap are neither drawn on nor encoded
+        if not delivery.due():
+            continue
+        if result.scores is not None:
+            display_probabilities(image, result.scores, actions)
+
+        render_started = time.perf_counter() if metrics.enabled else 0.0
+        delivery.show(FRAME_WINDOW, image)
+        if metrics.enabled:
+            metrics.record("render", time.perf_counter() - render_started)
+            batcher_stats = batcher.stats() if batcher is not classifier else {}
+            metrics.publish({**pipeline.stats(), **batcher_stats, **delivery.stats(),
+                             **get_chat_writer(db).stats()},
+                            METRICS_PANEL if st.session_state.show_metrics else None)
+finally:
+    if pipeline:
+        pipeline.stop()
+        # Words committed after the last frame was shown
+        for index in pipeline.committed():
+            update_sentence(actions[index])
 
 if cap:
     cap.release()
@@ -223,16 +272,17 @@ if cap:
 # Sentence handling after collecting 5 new words
 if st.session_state.words_collected >= 5:
     raw_sentence = ' '.join(st.session_state.sentence)
-    corrected = correct_grammar_with_deepseek(raw_sentence)
+    job = correct_grammar_with_deepseek(raw_sentence)
+    corrected = show_correction(job, st.empty(), "✅ Interviewee said: {}")
     st.session_state.final_sentence = corrected
 
-    st.info(f"✅ Interviewee said: {corrected}")
     speak_text(corrected)
 
-    db.collection("chat").add({
+    get_chat_writer(db).add({
         "message": corrected,
         "sender": "interviewee",
-        "timestamp": datetime.utcnow()
+        # Set by Firestore at commit, so ChatSync's cursor follows commit order
+        "timestamp": firestore.SERVER_TIMESTAMP
     })
 
     st.session_state.words_collected = 0
@@ -5,6 +5,7 @@ import json
 import numpy as np
 import streamlit as st
 from vosk import Model, KaldiRecognizer
+from resources import get_resource
 
 # === Configuration ===
 MODEL_PATH = r"C:\Users\conta\Desktop\Web\vosk-model-small-en-us-0.15"  # Replace with your actual path
@@ -15,7 +16,13 @@ if not os.path.exists(MODEL_PATH):
     st.error("❌ Vosk model not found. Download and place it in the project folder.")
     st.stop()
 
-model = Model(MODEL_PATH)
+# Decode a little silence so the first recording doesn't pay for lazy setup
+def warm_up_recognizer(vosk_model):
+    rec = KaldiRecognizer(vosk_model, SAMPLE_RATE)
+    rec.AcceptWaveform(b"\0\0" * (SAMPLE_RATE // 10))
+    rec.FinalResult()
+
+model = get_resource(f"vosk:{MODEL_PATH}", lambda: Model(MODEL_PATH), warmup=warm_up_recognizer)
 q = queue.Queue()
 
 # === Audio Callback ===
@@ -0,0 +1,237 @@
+import queue
+import threading
+import time
+
+from keypoints import get_extractor, layout_for_size
+from landmark_engine import draw_landmarks
+
+
+# Bounded queue where the newest item always wins
+class LatestQueue:
+    """Queue that drops its oldest item instead of blocking the producer."""
+
+    def __init__(self, maxsize=1):
+        self._queue = queue.Queue(maxsize)
+        self.dropped = 0
+
+    def put(self, item):
+        while True:
+            try:
+                self._queue.put_nowait(item)
+                return
+            except queue.Full:
+                try:
+                    self._queue.get_nowait()
+                    self.dropped += 1
+                except queue.Empty:
+                    pass
+
+    def get(self, timeout=None):
+        try:
+            return self._queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def qsize(self):
+        return self._queue.qsize()
+
+
+class FrameResult:
+    def __init__(self, frame_id, captured_at, image, probabilities, fresh, scores=None):
+        self.frame_id = frame_id
+        self.captured_at = captured_at
+        self.image = image
+        # Latest classifier output; ``fresh`` is True only if computed for this frame
+        self.probabilities = probabilities
+        self.fresh = fresh
+        # Smoothed scores after the latest inference, for the overlay
+        self.scores = scores
+
+
+# Capture -> landmark -> classify, each stage on its own thread
+class SignPipeline:
+    """Runs the detection loop on worker threads joined by LatestQueues.
+
+    A slow stage only causes older frames to be dropped; it never backs up
+    the camera. An exception in any stage stops the pipeline and sets
+    ``error``. The Streamlit script thread just calls ``get()`` and renders
+    whatever finished most recently. ``window`` is written only by the
+    landmark worker, which hands the classifier a copy of it every
+    ``stride`` frames, extracted in the feature layout matching the
+    window's width. Stage timings go to ``metrics`` (an
+    instrumentation.PipelineMetrics) only while it is enabled. With a
+    ``gate`` (a motion_gate.MotionGate), frames it rejects skip Holistic
+    and the classifier; they are shown with the last landmarks drawn and
+    the last probabilities. With a ``smoother`` (a
+    smoothing.PredictionSmoother), every inference is fed to it on the
+    classify worker, before any result can be dropped; committed word
+    indices are queued without loss for ``committed()``.
+    """
+
+    POLL_SECONDS = 0.1
+
+    def __init__(self, cap, engine, classifier, window, stride=1, queue_size=1, metrics=None, gate=None,
+                 smoother=None, threshold=0.7):
+        self.cap = cap
+        self.engine = engine
+        self.classifier = classifier
+        self.window = window
+        self._extract = get_extractor(layout_for_size(window.size))
+        self.stride = max(1, int(stride))
+        self.metrics = metrics
+        self.gate = gate
+        self.smoother = smoother
+        self.threshold = threshold
+        self.error = None
+        self.frames_captured = 0
+        self.frames_landmarked = 0
+        self.inferences = 0
+        self._frames = LatestQueue(queue_size)
+        self._windows = LatestQueue(queue_size)
+        self._results = LatestQueue(queue_size)
+        self._committed = queue.Queue()
+        self._since_inference = 0
+        self._last_probabilities = None
+        self._last_scores = None
+        self._last_results = None
+        self._stop = threading.Event()
+        self._threads = []
+
+    def start(self):
+        for name, target in [
+            ("capture", self._capture_loop),
+            ("landmark", self._landmark_loop),
+            ("classify", self._classify_loop),
+        ]:
+            thread = threading.Thread(target=self._run_stage, args=(name, target), name=f"sign-{name}",
+                                      daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        return self
+
+    def stop(self):
+        self._stop.set()
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
+
+    def running(self):
+        return not self._stop.is_set()
+
+    def alive(self):
+        """True while every worker thread is still running."""
+        return bool(self._threads) and all(thread.is_alive() for thread in self._threads)
+
+    def get(self, timeout=None):
+        """Return the newest finished FrameResult, or None on timeout."""
+        return self._results.get(timeout)
+
+    def committed(self):
+        """Return the word indices the smoother committed since the last call."""
+        indices = []
+        while True:
+            try:
+                indices.append(self._committed.get_nowait())
+            except queue.Empty:
+                return indices
+
+    def stats(self):
+        gate_stats = self.gate.stats() if self.gate is not None else {}
+        return {
+            **gate_stats,
+            "frames_captured": self.frames_captured,
+            "frames_landmarked": self.frames_landmarked,
+            "inferences": self.inferences,
+            "capture_queue": self._frames.qsize(),
+            "classify_queue": self._windows.qsize(),
+            "result_queue": self._results.qsize(),
+            "capture_dropped": self._frames.dropped,
+            "classify_dropped": self._windows.dropped,
+            "result_dropped": self._results.dropped,
+        }
+
+    def _timing(self):
+        return self.metrics is not None and self.metrics.enabled
+
+    def _fail(self, message):
+        self.error = message
+        self._stop.set()
+
+    def _run_stage(self, name, loop):
+        # Whatever a stage raises stops the pipeline with an error the page can show
+        try:
+            loop()
+        except Exception as e:
+            self._fail(f"Processing error in {name}: {str(e)}")
+
+    def _capture_loop(self):
+        clock = time.perf_counter
+        while not self._stop.is_set():
+            timing = self._timing()
+            t0 = clock() if timing else 0.0
+            ret, frame = self.cap.read()
+            if not ret:
+                self._fail("Webcam error")
+                return
+            if timing:
+                self.metrics.record("capture", clock() - t0)
+            self.frames_captured += 1
+            self._frames.put((self.frames_captured, time.perf_counter(), frame))
+
+    def _landmark_loop(self):
+        clock = time.perf_counter
+        while not self._stop.is_set():
+            item = self._frames.get(self.POLL_SECONDS)
+            if item is None:
+                continue
+            frame_id, captured_at, image = item
+            timing = self._timing()
+            if self.gate is not None and self._last_results is not None and not self.gate.check(image):
+                # Idle: nothing moved, so the previous landmarks still fit this frame
+                draw_landmarks(image, self._last_results)
+                self._windows.put((frame_id, captured_at, image, None))
+                continue
+            t0 = clock() if timing else 0.0
+            results = self.engine.process(image)
+            self._last_results = results
+            t1 = clock() if timing else 0.0
+            draw_landmarks(image, results)
+            t2 = clock() if timing else 0.0
+            self._extract(results, self.window.next_row())
+            self.window.commit()
+            if timing:
+                self.metrics.record("landmark", t1 - t0)
+                self.metrics.record("extract", clock() - t2)
+            self.frames_landmarked += 1
+            self._since_inference += 1
+            batch = None
+            if self.window.is_full() and self._since_inference >= self.stride:
+                batch = self.window.batch().copy()
+                self._since_inference = 0
+            self._windows.put((frame_id, captured_at, image, batch))
+
+    def _classify_loop(self):
+        while not self._stop.is_set():
+            item = self._windows.get(self.POLL_SECONDS)
+            if item is None:
+                continue
+            frame_id, captured_at, image, batch = item
+            fresh = batch is not None
+            if fresh:
+                timing = self._timing()
+                t0 = time.perf_counter() if timing else 0.0
+                self._last_probabilities = self.classifier.predict(batch)[0]
+                if timing:
+                    self.metrics.record("classify", time.perf_counter() - t0)
+                self.inferences += 1
+                if self.smoother is not None:
+                    committed = self.smoother.update(self._last_probabilities, self.threshold)
+                    if committed is not None:
+                        self._committed.put(committed)
+                    self._last_scores = self.smoother.scores.copy()
+                else:
+                    self._last_scores = self._last_probabilities
+            self._results.put(FrameResult(frame_id, captured_at, image, self._last_probabilities, fresh,
+                                          self._last_scores))
+            if self._timing():
+                self.metrics.frame_processed()
@@ -0,0 +1,170 @@
+# Export the sign classifier to compact TFLite models, gated on parity
+#
+#   python quantize.py --model pages/best_model_withGPU3.h5 --cache-dir .keypoint_cache
+#
+# Builds 30-frame windows from the keypoint cache (fill it by running
+# transcribe.py over recorded interviews), holds out a share of them,
+# and calibrates the int8 export on the rest. Each export is compared
+# with the original Keras model on the held-out windows. Exports whose
+# top-1 agreement or probability drift miss the thresholds are rejected
+# and not written. Accepted models are written next to the source as
+# <name>.<mode>.tflite, with a <name>.quantize.json report.
+import argparse
+import json
+import multiprocessing
+import os
+import shutil
+import tempfile
+import time
+
+import numpy as np
+
+from inference import DEFAULT_MODEL
+from keypoint_cache import DEFAULT_CACHE_DIR, cached_windows
+
+MODES = ["float16", "int8"]
+
+
+def split(windows, holdout, seed=0):
+    order = np.random.default_rng(seed).permutation(len(windows))
+    cut = max(1, int(round(len(windows) * holdout)))
+    return windows[order[cut:]], windows[order[:cut]]
+
+
+def fixed_batch_model(model):
+    # The LSTMs only lower to TFLite with fully static shapes
+    import keras
+
+    inputs = keras.Input(model.input_shape[1:], batch_size=1)
+    return keras.Model(inputs, model(inputs))
+
+
+def convert(model, mode, calibration=None):
+    import tensorflow as tf
+
+    converter = tf.lite.TFLiteConverter.from_keras_model(fixed_batch_model(model))
+    converter.optimizations = [tf.lite.Optimize.DEFAULT]
+    if mode == "float16":
+        converter.target_spec.supported_types = [tf.float16]
+    elif calibration is not None:
+        converter.representative_dataset = lambda: ([window[np.newaxis]] for window in calibration)
+    return converter.convert()
+
+
+def _calibrated_int8(model_path, calibration_path, output_path):
+    # Runs in a child process: calibration can abort the interpreter outright
+    # on graphs it cannot quantise, which must not take the tool down with it
+    from keras.models import load_model
+
+    data = convert(load_model(model_path), "int8", np.load(calibration_path))
+    with open(output_path, "wb") as f:
+        f.write(data)
+
+
+def export_int8(model, model_path, calibration, workdir):
+    """Full-integer export calibrated on ``calibration``, else dynamic-range int8."""
+    calibration_path = os.path.join(workdir, "calibration.npy")
+    output_path = os.path.join(workdir, "int8.tflite")
+    np.save(calibration_path, calibration)
+    child = multiprocessing.get_context("spawn").Process(
+        target=_calibrated_int8, args=(model_path, calibration_path, output_path))
+    child.start()
+    child.join()
+    if child.exitcode == 0 and os.path.exists(output_path):
+        with open(output_path, "rb") as f:
+            return f.read(), "full-integer"
+    print(f"  calibrated int8 conversion failed (exit code {child.exitcode}); "
+          f"falling back to dynamic-range int8 weights")
+    return convert(model, "int8"), "dynamic-range"
+
+
+def parity(reference, candidate):
+    top1 = float(np.mean(np.argmax(reference, axis=1) == np.argmax(candidate, axis=1)))
+    drift = np.abs(reference - candidate)
+    return {"top1_agreement": round(top1, 4), "max_drift": float(drift.max()), "mean_drift": float(drift.mean())}
+
+
+def ms_per_window(classifier, windows, limit=200):
+    windows = windows[:limit]
+    start = time.perf_counter()
+    for window in windows:
+        classifier.predict(window[np.newaxis])
+    return (time.perf_counter() - start) / len(windows) * 1000.0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Export float16/int8 TFLite classifiers with a parity gate")
+    parser.add_argument("--model", default=DEFAULT_MODEL)
+    parser.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR, help="keypoint cache to draw windows from")
+    parser.add_argument("--output-dir", help="default: next to --model")
+    parser.add_argument("--modes", nargs="+", choices=MODES, default=MODES)
+    parser.add_argument("--window-stride", type=int, default=10, help="frames between cached windows")
+    parser.add_argument("--holdout", type=float, default=0.2, help="share of windows kept for the parity check")
+    parser.add_argument("--calibration-windows", type=int, default=300)
+    parser.add_argument("--min-agreement", type=float, default=0.98, help="minimum top-1 agreement")
+    parser.add_argument("--max-drift", type=float, default=0.05, help="maximum absolute probability drift")
+    parser.add_argument("--threads", type=int, default=1)
+    args = parser.parse_args(argv)
+
+    from inference import SignClassifier, TFLiteClassifier
+
+    if not os.path.exists(args.model):
+        parser.error(f"model not found: {args.model}")
+    original = SignClassifier.load(args.model)
+    windows = cached_windows(args.cache_dir, original.sequence_length, original.layout, args.window_stride)
+    if len(windows) < 2:
+        parser.error(f"need at least 2 cached windows in {args.cache_dir}; run transcribe.py on some videos first")
+    calibration, held_out = split(windows, args.holdout)
+    calibration = calibration[:args.calibration_windows]
+    reference = original.predict(held_out)
+    print(f"{len(windows)} windows: {len(calibration)} for calibration, {len(held_out)} held out")
+
+    output_dir = args.output_dir or os.path.dirname(os.path.abspath(args.model))
+    os.makedirs(output_dir, exist_ok=True)
+    stem = os.path.splitext(os.path.basename(args.model))[0]
+    report = {
+        "model": os.path.abspath(args.model),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "held_out_windows": len(held_out),
+        "thresholds": {"min_agreement": args.min_agreement, "max_drift": args.max_drift},
+        "original": {"bytes": os.path.getsize(args.model), "ms_per_window": ms_per_window(original, held_out)},
+        "exports": {},
+    }
+    rejected = 0
+    with tempfile.TemporaryDirectory() as workdir:
+        for mode in args.modes:
+            print(f"{mode}:")
+            quantization = mode
+            if mode == "int8":
+                data, quantization = export_int8(original.model, args.model, calibration, workdir)
+            else:
+                data = convert(original.model, mode)
+            candidate_path = os.path.join(workdir, f"{mode}.candidate.tflite")
+            with open(candidate_path, "wb") as f:
+                f.write(data)
+            candidate = TFLiteClassifier(candidate_path, num_threads=args.threads)
+            result = parity(reference, candidate.predict(held_out))
+            result.update(quantization=quantization, bytes=len(data),
+                          ms_per_window=ms_per_window(candidate, held_out))
+            accepted = result["top1_agreement"] >= args.min_agreement and result["max_drift"] <= args.max_drift
+            result["accepted"] = accepted
+            if accepted:
+                result["path"] = os.path.join(output_dir, f"{stem}.{mode}.tflite")
+                shutil.move(candidate_path, result["path"])
+            else:
+                rejected += 1
+            report["exports"][mode] = result
+            print(f"  {'accepted' if accepted else 'REJECTED'}: top-1 agreement {result['top1_agreement']:.2%}, "
+                  f"max drift {result['max_drift']:.4f}, {len(data) / 2**20:.2f} MiB, "
+                  f"{result['ms_per_window']:.2f} ms/window "
+                  f"(original {report['original']['ms_per_window']:.2f} ms)")
+
+    report_path = os.path.join(output_dir, f"{stem}.quantize.json")
+    with open(report_path, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"wrote {report_path}")
+    return 1 if rejected else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,100 @@
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+
+def current_rss():
+    """RSS of this process in bytes (peak RSS without psutil), or None."""
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss
+    except ImportError:
+        pass
+    try:
+        import resource
+        import sys
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Peak RSS: kilobytes on Linux, bytes on macOS
+        return peak if sys.platform == "darwin" else peak * 1024
+    except ImportError:
+        return None
+
+
+class ResourceInfo:
+    def __init__(self, name, value, load_seconds, warmup_seconds, memory_bytes):
+        self.name = name
+        self.value = value
+        self.load_seconds = load_seconds
+        self.warmup_seconds = warmup_seconds
+        # Growth in process RSS across load + warm-up; approximate when
+        # several resources load concurrently
+        self.memory_bytes = memory_bytes
+
+
+# Process-wide registry of heavy, shareable resources (models, recognizers)
+_resources = {}
+_locks = {}
+_registry_lock = threading.Lock()
+
+
+def get_resource(name, loader, warmup=None):
+    """Return the resource registered under ``name``, loading it on first use.
+
+    ``loader()`` runs once per process even if many sessions ask at the
+    same time; ``warmup(value)``, if given, runs right after it so the first
+    real request does not pay for lazy initialisation. A hook whose
+    resource already warmed up while loading returns the seconds that took,
+    which are recorded in place of the hook's own run time.
+    """
+    info = _resources.get(name)
+    if info is not None:
+        return info.value
+    with _registry_lock:
+        lock = _locks.setdefault(name, threading.Lock())
+    with lock:
+        info = _resources.get(name)
+        if info is None:
+            info = _load(name, loader, warmup)
+            _resources[name] = info
+    return info.value
+
+
+def _load(name, loader, warmup):
+    rss_before = current_rss()
+    start = time.perf_counter()
+    value = loader()
+    load_seconds = time.perf_counter() - start
+    warmup_seconds = None
+    if warmup is not None:
+        start = time.perf_counter()
+        reported = warmup(value)
+        warmup_seconds = time.perf_counter() - start
+        if isinstance(reported, float):
+            warmup_seconds = reported
+    rss_after = current_rss()
+    memory = rss_after - rss_before if rss_before is not None and rss_after is not None else None
+    logger.info("Loaded %s in %.2fs (warm-up %s, memory %s)", name, load_seconds,
+                "n/a" if warmup_seconds is None else f"{warmup_seconds:.2f}s",
+                "n/a" if memory is None else f"{memory / 2**20:.1f} MiB")
+    return ResourceInfo(name, value, load_seconds, warmup_seconds, memory)
+
+
+def resource_stats():
+    return [
+        {
+            "name": info.name,
+            "load_seconds": round(info.load_seconds, 3),
+            "warmup_seconds": None if info.warmup_seconds is None else round(info.warmup_seconds, 3),
+            "memory_mb": None if info.memory_bytes is None else round(info.memory_bytes / 2**20, 1),
+        }
+        for info in list(_resources.values())
+    ]
+
+
+def describe_resource(info):
+    """One-line summary of a resource_stats() entry, with "n/a" for missing readings."""
+    warmup = "n/a" if info["warmup_seconds"] is None else f"{info['warmup_seconds']}s"
+    memory = "n/a" if info["memory_mb"] is None else f"{info['memory_mb']} MB"
+    return f"{info['name']}: loaded in {info['load_seconds']}s, warm-up {warmup}, {memory}"
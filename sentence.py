@@ -0,0 +1,13 @@
+# Sentence building shared by the pages and the batch transcriber
+def append_word(sentence, word, max_words=None):
+    """Append ``word`` unless it repeats the last word.
+
+    Returns the (possibly trimmed to ``max_words``) sentence and whether the
+    word was added.
+    """
+    added = len(sentence) == 0 or word != sentence[-1]
+    if added:
+        sentence.append(word)
+    if max_words is not None and len(sentence) > max_words:
+        sentence = sentence[-max_words:]
+    return sentence, added
@@ -0,0 +1,57 @@
+import numpy as np
+
+from keypoints import KEYPOINT_SIZE
+
+SEQUENCE_LENGTH = 30
+
+
+# Fixed-size ring buffer for the classifier's frame window
+class SequenceWindow:
+    """Keeps the last ``length`` keypoint vectors as one float32 block.
+
+    Every frame is written twice, at ``i`` and ``i + length``, so the
+    frames in chronological order are always the contiguous slice
+    ``[index, index + length)``. The classifier gets a view of that slice
+    instead of a freshly stacked array.
+    """
+
+    def __init__(self, length=SEQUENCE_LENGTH, size=KEYPOINT_SIZE):
+        self.length = length
+        self.size = size
+        self._data = np.zeros((2 * length, size), dtype=np.float32)
+        self._index = 0
+        self._count = 0
+
+    def __len__(self):
+        return self._count
+
+    def is_full(self):
+        return self._count == self.length
+
+    def next_row(self):
+        # Writable row for the next frame; call commit() once it is filled
+        return self._data[self._index]
+
+    def commit(self):
+        i = self._index
+        self._data[i + self.length] = self._data[i]
+        self._index = (i + 1) % self.length
+        if self._count < self.length:
+            self._count += 1
+
+    def push(self, keypoints):
+        self._data[self._index] = keypoints
+        self.commit()
+
+    def view(self):
+        # Frames oldest to newest, shape (length, size); only valid once full
+        return self._data[self._index:self._index + self.length]
+
+    def batch(self):
+        # Same view with a leading batch axis, shape (1, length, size)
+        return self.view()[np.newaxis]
+
+    def clear(self):
+        self._data.fill(0.0)
+        self._index = 0
+        self._count = 0
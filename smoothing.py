@@ -0,0 +1,88 @@
+from collections import Counter, deque
+
+import numpy as np
+import streamlit as st
+
+SMOOTHING_METHODS = ["None", "EMA", "Majority vote"]
+
+
+# Temporal smoothing + hysteresis over the classifier's probability stream
+class PredictionSmoother:
+    """Turns per-inference probabilities into committed word indices.
+
+    ``method`` is one of SMOOTHING_METHODS. EMA uses ``alpha = 2 / (window + 1)``;
+    majority vote scores each word by its share of above-threshold argmax
+    votes over the last ``window`` inferences and needs more than half of
+    them. A word is committed once it has stayed on top
+    for ``hysteresis`` consecutive updates, and is not committed again
+    until its score falls back under the threshold.
+    """
+
+    def __init__(self, method="None", window=5, hysteresis=1):
+        if method not in SMOOTHING_METHODS:
+            raise ValueError(f"Unknown smoothing method: {method}")
+        self.method = method
+        self.window = window
+        self.hysteresis = hysteresis
+        self.alpha = 2.0 / (window + 1)
+        self.scores = None
+        self._votes = deque(maxlen=window)
+        self._candidate = None
+        self._streak = 0
+        self._committed = None
+
+    def reset(self):
+        self.scores = None
+        self._votes.clear()
+        self._candidate = None
+        self._streak = 0
+        self._committed = None
+
+    def _smooth(self, probabilities, threshold):
+        if self.method == "EMA":
+            if self.scores is None:
+                return np.array(probabilities, dtype=np.float32)
+            return self.alpha * probabilities + (1.0 - self.alpha) * self.scores
+        if self.method == "Majority vote":
+            top = int(np.argmax(probabilities))
+            self._votes.append(top if probabilities[top] > threshold else None)
+            counts = Counter(v for v in self._votes if v is not None)
+            scores = np.zeros(len(probabilities), dtype=np.float32)
+            for index, count in counts.items():
+                scores[index] = count / self.window
+            return scores
+        return probabilities
+
+    def update(self, probabilities, threshold):
+        """Feed one inference; return the index of a newly committed word or None."""
+        self.scores = self._smooth(probabilities, threshold)
+        top = int(np.argmax(self.scores))
+        if self.method == "Majority vote":
+            above = self.scores[top] > 0.5
+        else:
+            above = self.scores[top] > threshold
+
+        if not above:
+            self._candidate = None
+            self._streak = 0
+            self._committed = None
+            return None
+
+        if top == self._candidate:
+            self._streak += 1
+        else:
+            self._candidate = top
+            self._streak = 1
+        if self._streak >= self.hysteresis and top != self._committed:
+            self._committed = top
+            return top
+        return None
+
+
+# One smoother per session, rebuilt when its settings change
+def get_session_smoother(method, window, hysteresis):
+    settings = (method, window, hysteresis)
+    if st.session_state.get("smoother_settings") != settings:
+        st.session_state.smoother = PredictionSmoother(method, window, hysteresis)
+        st.session_state.smoother_settings = settings
+    return st.session_state.smoother
@@ -0,0 +1,156 @@
+import hashlib
+import importlib.util
+import logging
+import os
+import queue
+import threading
+import wave
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_AUDIO_CACHE = os.environ.get(
+    "SPEECH_CACHE_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), ".speech_cache"),
+)
+
+
+# Audio sinks: where rendered utterances are played
+class NullSink:
+    """Discards audio; for headless servers and tests."""
+
+    def __init__(self):
+        self.played = []
+
+    def play(self, path):
+        self.played.append(path)
+
+
+class SoundDeviceSink:
+    """Plays 16-bit PCM WAV files on the default output device."""
+
+    def play(self, path):
+        import sounddevice as sd
+
+        with wave.open(path, "rb") as f:
+            rate = f.getframerate()
+            channels = f.getnchannels()
+            data = np.frombuffer(f.readframes(f.getnframes()), dtype=np.int16)
+        sd.play(data.reshape(-1, channels), rate)
+        sd.wait()
+
+
+def pyttsx3_engine(rate=150, volume=1.0):
+    import pyttsx3
+
+    engine = pyttsx3.init()
+    engine.setProperty('rate', rate)
+    engine.setProperty('volume', volume)
+    return engine
+
+
+# Long-lived text-to-speech worker
+class SpeechWorker:
+    """Speaks queued utterances on a background thread with one TTS engine.
+
+    pyttsx3 engines must stay on the thread that created them, so the
+    engine is built lazily inside the worker. Each utterance is rendered
+    once to ``<cache_dir>/<sha256>.wav`` and replayed from there through
+    ``sink``; if the cached file cannot be played, the engine speaks it
+    directly instead. Without a ``sink`` and with no ``sounddevice`` to
+    build the default one, every utterance is spoken directly and nothing
+    is rendered.
+    """
+
+    def __init__(self, sink=None, cache_dir=DEFAULT_AUDIO_CACHE, engine_factory=pyttsx3_engine,
+                 rate=150, volume=1.0):
+        if sink is None and importlib.util.find_spec("sounddevice") is not None:
+            sink = SoundDeviceSink()
+        elif sink is None:
+            logger.info("sounddevice not installed; speaking without the audio cache")
+        self.sink = sink
+        self.cache_dir = cache_dir
+        self.engine_factory = engine_factory
+        self.rate = rate
+        self.volume = volume
+        self.spoken = 0
+        self.cache_hits = 0
+        self.synthesized = 0
+        self.errors = 0
+        self._queue = queue.Queue()
+        os.makedirs(cache_dir, exist_ok=True)
+        self._thread = threading.Thread(target=self._run, name="speech", daemon=True)
+        self._thread.start()
+
+    def say(self, text):
+        if text:
+            self._queue.put(text)
+
+    def join(self):
+        """Block until everything queued so far has been spoken."""
+        self._queue.join()
+
+    def stats(self):
+        return {
+            "queued": self._queue.qsize(),
+            "spoken": self.spoken,
+            "cache_hits": self.cache_hits,
+            "synthesized": self.synthesized,
+            "errors": self.errors,
+        }
+
+    def cache_path(self, text):
+        key = hashlib.sha256(f"{self.rate}\x1f{self.volume}\x1f{text}".encode()).hexdigest()
+        return os.path.join(self.cache_dir, key + ".wav")
+
+    def _render(self, engine, text):
+        path = self.cache_path(text)
+        if os.path.exists(path):
+            self.cache_hits += 1
+            return path
+        tmp = path + ".tmp.wav"
+        engine.save_to_file(text, tmp)
+        engine.runAndWait()
+        os.replace(tmp, path)
+        self.synthesized += 1
+        return path
+
+    def _run(self):
+        engine = None
+        while True:
+            text = self._queue.get()
+            try:
+                if engine is None:
+                    engine = self.engine_factory(self.rate, self.volume)
+                if self.sink is None:
+                    engine.say(text)
+                    engine.runAndWait()
+                    self.spoken += 1
+                    continue
+                path = self._render(engine, text)
+                try:
+                    self.sink.play(path)
+                except Exception:
+                    logger.warning("Cached speech unplayable, speaking directly", exc_info=True)
+                    engine.say(text)
+                    engine.runAndWait()
+                self.spoken += 1
+            except Exception:
+                self.errors += 1
+                logger.exception("Speech failed")
+            finally:
+                self._queue.task_done()
+
+
+_worker = None
+_worker_lock = threading.Lock()
+
+
+# Process-wide worker so every session shares one engine
+def get_speech_worker():
+    global _worker
+    with _worker_lock:
+        if _worker is None:
+            _worker = SpeechWorker()
+        return _worker
@@ -0,0 +1,245 @@
+# Headless batch transcription of recorded sign-language videos
+#
+#   python transcribe.py interviews/ --output-dir transcripts --workers 8
+#
+# Each worker process owns one Holistic engine and one classifier and
+# streams frames through the same extraction, windowing, smoothing and
+# sentence logic as the Streamlit pages. One JSON transcript is written
+# per video. Extracted keypoints are cached by video content hash, so
+# re-scoring the same footage skips MediaPipe entirely.
+import argparse
+import contextlib
+import json
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from backends import BACKENDS
+from inference import DEFAULT_MODEL
+from keypoint_cache import DEFAULT_CACHE_DIR
+from landmark_engine import DEFAULT_PROFILE, PROFILES
+from sentence import append_word
+
+VIDEO_EXTENSIONS = (".mp4", ".avi", ".mov", ".mkv", ".webm")
+
+# Per-process state, set up once by _init_worker
+_engine = None
+_classifier = None
+
+
+def _init_worker(model_path, threads_per_worker, profile=DEFAULT_PROFILE, backend=None):
+    global _engine, _classifier
+    # Heavy imports stay out of the parent so workers can be spawned cleanly
+    import cv2
+    import tensorflow as tf
+    from backends import load_inference_config, select_backend
+    from landmark_engine import LandmarkEngine
+
+    cv2.setNumThreads(threads_per_worker)
+    tf.config.threading.set_intra_op_parallelism_threads(threads_per_worker)
+    tf.config.threading.set_inter_op_parallelism_threads(threads_per_worker)
+    _engine = LandmarkEngine(min_detection_confidence=0.5, min_tracking_confidence=0.5, profile=profile)
+    config = dict(load_inference_config(), threads=threads_per_worker)
+    if backend:
+        config["backend"] = backend
+    _classifier = select_backend(model_path, **config)
+
+
+def _extract_frames(cap, writer):
+    import numpy as np
+    from keypoints import KEYPOINT_SIZE, extract_keypoints
+
+    row = np.empty(KEYPOINT_SIZE, dtype=np.float32)
+    try:
+        with writer if writer is not None else contextlib.nullcontext():
+            while True:
+                ret, frame = cap.read()
+                if not ret:
+                    break
+                extract_keypoints(_engine.process(frame), row)
+                if writer is not None:
+                    writer.append(row)
+                yield row
+    finally:
+        cap.release()
+
+
+def _keypoint_rows(path, cache):
+    # Returns (fps, rows): memory-mapped rows from the cache, or a generator
+    # that runs Holistic on the video and fills the cache as it goes
+    import cv2
+
+    key = cache.key(path, _engine.settings()) if cache is not None else None
+    cached = cache.load(key) if key is not None else None
+    if cached is not None:
+        keypoints, meta = cached
+        return meta["fps"], keypoints
+
+    cap = cv2.VideoCapture(path)
+    if not cap.isOpened():
+        raise IOError(f"Cannot open video: {path}")
+    fps = cap.get(cv2.CAP_PROP_FPS) or 30.0
+    writer = cache.writer(key, fps=fps, video=os.path.abspath(path)) if key is not None else None
+    return fps, _extract_frames(cap, writer)
+
+
+def transcribe_video(path, out_path, threshold=0.7, stride=1, smoothing="None",
+                     smoothing_window=5, hysteresis=1, cache_dir=None):
+    from inference import ACTIONS
+    from keypoint_cache import KeypointCache
+    from keypoints import to_hands_pose
+    from sequence_buffer import SequenceWindow
+    from smoothing import PredictionSmoother
+
+    cache = KeypointCache(cache_dir) if cache_dir else None
+    window = SequenceWindow(_classifier.sequence_length, _classifier.feature_size)
+    # Keypoints are extracted and cached in the full layout; a hands+pose
+    # classifier gets them with the face mesh sliced off
+    reduce = to_hands_pose if _classifier.layout == "hands_pose" else None
+    smoother = PredictionSmoother(smoothing, smoothing_window, hysteresis)
+    sentence = []
+    words = []
+    frame_index = 0
+    since_inference = 0
+    inferences = 0
+    start = time.perf_counter()
+    fps, rows = _keypoint_rows(path, cache)
+    for row in rows:
+        window.push(reduce(row) if reduce else row)
+        since_inference += 1
+        if window.is_full() and since_inference >= stride:
+            since_inference = 0
+            probabilities = _classifier.predict(window.batch())[0]
+            inferences += 1
+            committed = smoother.update(probabilities, threshold)
+            if committed is not None:
+                sentence, added = append_word(sentence, ACTIONS[committed])
+                if added:
+                    words.append({
+                        "word": str(ACTIONS[committed]),
+                        "frame": frame_index,
+                        "time": round(frame_index / fps, 3),
+                        "confidence": round(float(smoother.scores[committed]), 4),
+                    })
+        frame_index += 1
+    elapsed = time.perf_counter() - start
+
+    transcript = {
+        "video": os.path.abspath(path),
+        "fps": fps,
+        "frames": frame_index,
+        "duration": round(frame_index / fps, 3),
+        "inferences": inferences,
+        "settings": {
+            "profile": _engine.profile,
+            "layout": _classifier.layout,
+            "backend": _classifier.backend,
+            "threshold": threshold,
+            "stride": stride,
+            "smoothing": smoothing,
+            "smoothing_window": smoothing_window,
+            "hysteresis": hysteresis,
+        },
+        "words": words,
+        "text": " ".join(w["word"] for w in words),
+        "processing_seconds": round(elapsed, 3),
+    }
+    os.makedirs(os.path.dirname(out_path) or ".", exist_ok=True)
+    with open(out_path, "w") as f:
+        json.dump(transcript, f, indent=2)
+    return out_path, frame_index, elapsed
+
+
+def find_videos(inputs):
+    """Return (video path, transcript name) pairs.
+
+    Videos found under a directory keep their path relative to it, so
+    a/session1.mp4 and b/session1.mp4 get a/session1.json and
+    b/session1.json; videos given directly are named after the file.
+    """
+    videos = []
+    for item in inputs:
+        if os.path.isdir(item):
+            for root, _, files in os.walk(item):
+                for name in sorted(files):
+                    if name.lower().endswith(VIDEO_EXTENSIONS):
+                        path = os.path.join(root, name)
+                        videos.append((path, os.path.splitext(os.path.relpath(path, item))[0] + ".json"))
+        else:
+            videos.append((item, os.path.splitext(os.path.basename(item))[0] + ".json"))
+    return videos
+
+
+def name_collisions(videos):
+    """Map each transcript name claimed by more than one video to those videos."""
+    claimed = {}
+    for path, name in videos:
+        claimed.setdefault(os.path.normcase(name), []).append(path)
+    return {name: paths for name, paths in claimed.items() if len(paths) > 1}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Transcribe recorded sign-language videos to JSON")
+    parser.add_argument("inputs", nargs="+", help="video files or directories")
+    parser.add_argument("--output-dir", default="transcripts")
+    parser.add_argument("--model", default=DEFAULT_MODEL)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--threads-per-worker", type=int, default=1)
+    parser.add_argument("--profile", default=DEFAULT_PROFILE, choices=list(PROFILES),
+                        help="Holistic performance profile")
+    parser.add_argument("--backend", choices=["auto", *BACKENDS],
+                        help="classifier backend (default: app_config.json, else auto)")
+    parser.add_argument("--threshold", type=float, default=0.7)
+    parser.add_argument("--stride", type=int, default=1)
+    parser.add_argument("--smoothing", default="None", choices=["None", "EMA", "Majority vote"])
+    parser.add_argument("--smoothing-window", type=int, default=5)
+    parser.add_argument("--hysteresis", type=int, default=1)
+    parser.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR, help="keypoint cache directory")
+    parser.add_argument("--no-cache", action="store_true", help="always rerun MediaPipe")
+    args = parser.parse_args(argv)
+
+    videos = find_videos(args.inputs)
+    if not videos:
+        parser.error("no videos found")
+    collisions = name_collisions(videos)
+    if collisions:
+        parser.error("videos would overwrite each other's transcripts:\n" + "\n".join(
+            f"  {name}: {', '.join(paths)}" for name, paths in sorted(collisions.items())))
+    os.makedirs(args.output_dir, exist_ok=True)
+
+    workers = max(1, min(args.workers, len(videos)))
+    print(f"Transcribing {len(videos)} video(s) with {workers} worker(s)")
+    start = time.perf_counter()
+    total_frames = 0
+    failures = 0
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_init_worker,
+        initargs=(args.model, args.threads_per_worker, args.profile, args.backend),
+    ) as pool:
+        futures = {
+            pool.submit(transcribe_video, path, os.path.join(args.output_dir, name), args.threshold,
+                        args.stride, args.smoothing, args.smoothing_window, args.hysteresis,
+                        None if args.no_cache else args.cache_dir): path
+            for path, name in videos
+        }
+        for future in as_completed(futures):
+            path = futures[future]
+            try:
+                out_path, frames, elapsed = future.result()
+            except Exception as e:
+                failures += 1
+                print(f"FAILED {path}: {e}")
+                continue
+            total_frames += frames
+            print(f"{path} -> {out_path} ({frames} frames, {frames / max(elapsed, 1e-9):.1f} fps)")
+
+    elapsed = time.perf_counter() - start
+    print(f"Done: {total_frames} frames in {elapsed:.1f}s ({total_frames / max(elapsed, 1e-9):.1f} fps overall)")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())